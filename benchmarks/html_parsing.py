@@ -0,0 +1,101 @@
+import argparse
+import gc
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bs4 import BeautifulSoup
+
+import task10_html_parser as html_parser
+from task10_html_parser.stream import build_index_stream, extract
+
+SECTION = (
+    '<div class="section s{i}" id="section-{i}">'
+    '<h{level}>Раздел {i}</h{level}>'
+    '<p>Параграф {i} с <b>выделением</b> и <a href="/page/{i}">ссылкой {i}</a>.</p>'
+    '<ul><li><a href="https://example.com/{i}">внешняя</a></li><li>пункт</li></ul>'
+    '<img src="/img/{i}.png" alt="картинка {i}">'
+    '<script>var value{i} = {i};</script>'
+    '</div>\n'
+)
+
+def write_fixture(path, sections):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("<!DOCTYPE html><html><head><title>Fixture</title></head><body>\n")
+        for i in range(sections):
+            f.write(SECTION.format(i=i, level=i % 6 + 1))
+        f.write("</body></html>\n")
+
+def with_tree(backend):
+    def run(path):
+        with open(path, encoding="utf-8") as f:
+            soup = BeautifulSoup(f.read(), backend)
+        return (len(html_parser.get_all_links(soup)), len(html_parser.get_all_headings(soup)),
+                len(html_parser.get_all_images(soup)))
+    return run
+
+def with_stream(path):
+    with open(path, "rb") as f:
+        result = extract(f, ('headings', 'links', 'images'))
+    return len(result['links']), len(result['headings']), len(result['images'])
+
+def with_index_stream(skip):
+    def run(path):
+        with open(path, "rb") as f:
+            index = build_index_stream(f, skip)
+        return (len(html_parser.get_all_links(index)), len(html_parser.get_all_headings(index)),
+                len(html_parser.get_all_images(index)))
+    return run
+
+def measure(func, path):
+    gc.collect()
+    start = time.perf_counter()
+    counts = func(path)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    tracemalloc.start()
+    func(path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return counts, elapsed, peak
+
+def main():
+    parser = argparse.ArgumentParser(description="Сравнение бэкендов разбора HTML и потокового извлечения")
+    parser.add_argument("fixtures", nargs="*", help="сохранённые HTML-файлы (по умолчанию генерируются)")
+    parser.add_argument("--sections", type=int, default=20000, help="размер генерируемой страницы")
+    args = parser.parse_args()
+
+    candidates = [("html.parser", with_tree("html.parser"))]
+    if html_parser.get_parser_backend("auto") == "lxml":
+        candidates.append(("lxml", with_tree("lxml")))
+    candidates.append(("index", with_index_stream(())))
+    candidates.append(("index -script", with_index_stream(("script",))))
+    candidates.append(("stream", with_stream))
+
+    workdir = None
+    fixtures = args.fixtures
+    if not fixtures:
+        workdir = tempfile.mkdtemp(prefix="html_fixtures_")
+        fixtures = [os.path.join(workdir, "large.html")]
+        write_fixture(fixtures[0], args.sections)
+    try:
+        for path in fixtures:
+            size = os.path.getsize(path) / 1024 / 1024
+            print(f"\n{os.path.basename(path)} ({size:.1f} МБ)")
+            print(f"{'Способ':<14} {'Время, с':>10} {'Пик памяти, МБ':>16} {'Ссылок/заголовков/картинок':>28}")
+            print("-" * 72)
+            for name, func in candidates:
+                counts, elapsed, peak = measure(func, path)
+                print(f"{name:<14} {elapsed:>10.2f} {peak / 1024 / 1024:>16.1f} {'/'.join(map(str, counts)):>28}")
+    finally:
+        if workdir:
+            shutil.rmtree(workdir)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import psutil
+
+import task8_system_monitor as monitor
+from task8_system_monitor import procfs
+
+MEMINFO = (
+    "MemTotal:       16384000 kB\n"
+    "MemFree:         8192000 kB\n"
+    "MemAvailable:   12288000 kB\n"
+    "Buffers:          512000 kB\n"
+    "Cached:          2048000 kB\n"
+    "SwapCached:            0 kB\n"
+    "Active:          4096000 kB\n"
+    "Inactive:        2048000 kB\n"
+    "Shmem:            128000 kB\n"
+    "SReclaimable:     256000 kB\n"
+    "SwapTotal:             0 kB\n"
+    "SwapFree:              0 kB\n"
+)
+
+STAT_TEMPLATE = (
+    "{pid} (worker-{pid}) {state} 1 {pid} {pid} 0 -1 4194560 1200 0 0 0 "
+    "{utime} {stime} 0 0 20 0 {threads} 0 {start} 123456789 {rss} 18446744073709551615 "
+    "1 1 0 0 0 0 0 0 0 0 0 0 17 0 0 0 0 0 0 0 0 0 0 0 0 0 0\n"
+)
+
+def build_proc_table(path, count):
+    with open(os.path.join(path, "stat"), "w") as f:
+        f.write("cpu  100 0 100 1000 0 0 0 0 0 0\nbtime 1700000000\n")
+    with open(os.path.join(path, "meminfo"), "w") as f:
+        f.write(MEMINFO)
+    with open(os.path.join(path, "uptime"), "w") as f:
+        f.write("1000.00 900.00\n")
+    for pid in range(1, count + 1):
+        directory = os.path.join(path, str(pid))
+        os.mkdir(directory)
+        with open(os.path.join(directory, "stat"), "w") as f:
+            f.write(STAT_TEMPLATE.format(pid=pid, state="SRD"[pid % 3], utime=pid * 3, stime=pid,
+                                         threads=1 + pid % 8, start=1000 + pid, rss=256 + pid % 1024))
+        with open(os.path.join(directory, "statm"), "w") as f:
+            f.write(f"{4096 + pid % 512} {256 + pid % 1024} 128 4 0 512 0\n")
+
+def bench(label, func, repeat):
+    timings = []
+    rows = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = len(func())
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    print(f"{label:<10} {rows:>8} {best * 1000:>12.2f} {rows / best if best else 0:>14.0f}")
+    return best
+
+def psutil_rows():
+    rows = []
+    for proc in psutil.process_iter(monitor.PROCESS_ATTRS):
+        rows.append(proc.info)
+    return rows
+
+def procfs_rows(path):
+    return list(procfs.iter_processes(path))
+
+def main():
+    parser = argparse.ArgumentParser(description="Сравнение procfs и psutil на синтетической таблице процессов")
+    parser.add_argument("--processes", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if not procfs.available():
+        print("Бенчмарк требует Linux с /proc")
+        sys.exit(1)
+
+    path = tempfile.mkdtemp(prefix="fake_proc_")
+    try:
+        build_proc_table(path, args.processes)
+        saved = psutil.PROCFS_PATH
+        psutil.PROCFS_PATH = path
+        try:
+            print(f"{'Бэкенд':<10} {'Процессов':>8} {'Лучшее, мс':>12} {'Процессов/с':>14}")
+            print("-" * 48)
+            slow = bench("psutil", psutil_rows, args.repeat)
+            fast = bench("procfs", lambda: procfs_rows(path), args.repeat)
+        finally:
+            psutil.PROCFS_PATH = saved
+        print(f"\nУскорение: {slow / fast:.1f}x")
+    finally:
+        shutil.rmtree(path)
+
+if __name__ == "__main__":
+    main()
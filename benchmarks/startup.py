@@ -0,0 +1,83 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from main import TASKS
+
+IMPORT_SNIPPET = (
+    "import time\n"
+    "start = time.perf_counter()\n"
+    "import {module}\n"
+    "print(time.perf_counter() - start)\n"
+)
+
+HEAVY_MODULES = ("psutil", "requests", "bs4")
+
+def measure_import(module_name, repeat=5):
+    samples = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-c", IMPORT_SNIPPET.format(module=module_name)],
+            cwd=ROOT, capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            return None, result.stderr.strip().splitlines()[-1]
+        samples.append(float(result.stdout.strip()) * 1000)
+    return statistics.median(samples), None
+
+def heavy_modules_after_import(module_name):
+    snippet = (
+        f"import sys\nimport {module_name}\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", snippet], cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip()
+
+def run_benchmark(repeat=5):
+    results = []
+    for key, title, module_name in [("0", "Меню (main.py)", "main")] + TASKS:
+        ms, ошибка = measure_import(module_name, repeat)
+        results.append({
+            'key': key,
+            'title': title,
+            'module': module_name,
+            'ms': ms,
+            'error': ошибка
+        })
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Время импорта меню и каждой задачи")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-menu-ms", type=float, default=None,
+                        help="Завершиться с ошибкой, если импорт main.py медленнее порога")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.repeat)
+    print(f"{'№':<4} {'Модуль':<26} {'Задача':<24} {'Импорт, мс':<12}")
+    print("-" * 70)
+    for item in results:
+        ms = f"{item['ms']:.2f}" if item['ms'] is not None else "ошибка"
+        print(f"{item['key']:<4} {item['module']:<26} {item['title']:<24} {ms:<12}")
+        if item['error']:
+            print(f"     {item['error']}")
+
+    menu = results[0]
+    loaded = heavy_modules_after_import("main")
+    if loaded:
+        print(f"\n❌ main.py загружает тяжёлые зависимости при старте: {loaded}")
+        sys.exit(1)
+    if args.max_menu_ms is not None and menu['ms'] is not None and menu['ms'] > args.max_menu_ms:
+        print(f"\n❌ Старт меню {menu['ms']:.2f} мс превышает порог {args.max_menu_ms:.2f} мс")
+        sys.exit(1)
+    print("\n✅ Старт меню не загружает тяжёлые зависимости")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import argparse
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import requests
+
+import task9_weather_parser as weather
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    latency = 0.2
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        city = self.path.split("?", 1)[0].strip("/")
+        body = f"{city}: ☀️ +5°C\n".encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_stub_server(latency):
+    handler = type("Handler", (StubHandler,), {'latency': latency})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def sequential(cities):
+    results = []
+    for city in cities:
+        response = requests.get(weather.build_url(city, 'short'), timeout=weather.REQUEST_TIMEOUT)
+        results.append(response.text if response.status_code == 200 else None)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Последовательная и параллельная загрузка погоды с локального сервера-заглушки")
+    parser.add_argument("--cities", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--workers", type=int, default=weather.MAX_CONCURRENCY)
+    args = parser.parse_args()
+
+    server = start_stub_server(args.latency)
+    weather.WTTR_URL = f"http://127.0.0.1:{server.server_address[1]}"
+    weather.configure_rate_limit(rate=1000, burst=args.cities)
+    cities = [f"City{i}" for i in range(args.cities)]
+    try:
+        start = time.perf_counter()
+        expected = sequential(cities)
+        slow = time.perf_counter() - start
+
+        start = time.perf_counter()
+        results = [text for text, _ in weather.get_weather_concurrent(cities, 'short', args.workers)]
+        fast = time.perf_counter() - start
+    finally:
+        server.shutdown()
+
+    print(f"Городов: {args.cities}, задержка сервера: {args.latency} сек")
+    print(f"Последовательно:  {slow:.2f} сек")
+    print(f"Параллельно ({args.workers}): {fast:.2f} сек")
+    print(f"Ускорение: {slow / fast:.1f}x")
+    if results != expected:
+        print("❌ Результаты параллельной загрузки отличаются от последовательной")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,555 @@
+import argparse
+import importlib
+import json
+import shlex
+import sys
+import time
+from collections import OrderedDict
+
+class CommandError(Exception):
+    pass
+
+class CommandParser(argparse.ArgumentParser):
+    def error(self, message):
+        raise CommandError(message)
+
+def task(module_name):
+    try:
+        return importlib.import_module(module_name)
+    except ImportError as e:
+        raise CommandError(f"не удалось загрузить {module_name} ({str(e)})")
+
+def status_result(success, message):
+    if not success:
+        raise CommandError(message)
+    return message
+
+def require_confirmation(args):
+    if not args.yes:
+        raise CommandError("операция удаления необратима, подтвердите флагом --yes")
+
+PAGE_MEMO_SIZE = 4
+_pages = OrderedDict()
+
+def full_url(url):
+    if not url.startswith(('http://', 'https://')):
+        return 'https://' + url
+    return url
+
+def load_page_cached(args):
+    url = full_url(args.url)
+    max_size = int(args.max_size * 1024 * 1024) if args.max_size is not None else None
+    key = (url, max_size, args.incremental, tuple(args.skip))
+    if key in _pages:
+        _pages.move_to_end(key)
+        return _pages[key]
+    soup, ошибка = task("task10_html_parser").load_page(url, max_size=max_size, incremental=args.incremental,
+                                                        skip=args.skip)
+    if soup is None:
+        raise CommandError(ошибка)
+    _pages[key] = soup
+    while len(_pages) > PAGE_MEMO_SIZE:
+        _pages.popitem(last=False)
+    return soup
+
+def monitor_system(args):
+    return task("task8_system_monitor").get_system_info()
+
+def monitor_cpu(args):
+    return task("task8_system_monitor").get_cpu_info()
+
+def monitor_memory(args):
+    return task("task8_system_monitor").get_memory_info()
+
+def monitor_disk(args):
+    return task("task8_system_monitor").get_disk_info(args.timeout)
+
+def monitor_top(args):
+    return task("task8_system_monitor").get_top_processes(args.by, args.count)
+
+def monitor_find(args):
+    return task("task8_system_monitor").find_processes_by_name(args.name)
+
+def monitor_details(args):
+    details = task("task8_system_monitor").get_process_details(args.pid)
+    if details is None:
+        raise CommandError("Процесс не найден или нет доступа")
+    return details
+
+def monitor_list(args):
+    processes = task("task8_system_monitor").get_all_processes()
+    return processes[:args.limit] if args.limit else processes
+
+def monitor_watch(args):
+    watch = importlib.import_module("task8_system_monitor.watch")
+    watcher = watch.ProcessWatcher(args.pids, args.interval)
+    if not watcher.series:
+        raise CommandError("Процессы не найдены или нет доступа")
+    deadline = time.monotonic() + args.duration
+    while True:
+        watcher.sample()
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        time.sleep(min(args.interval, remaining))
+    return watcher.report()
+
+def monitor_export(args):
+    exporter = importlib.import_module("task8_system_monitor.exporter")
+    print(f"Метрики доступны по адресу http://{args.host}:{args.port}/metrics", file=sys.stderr, flush=True)
+    try:
+        exporter.serve(args.host, args.port, args.interval)
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        raise CommandError(f"Ошибка запуска сервера: {str(e)}")
+    return "Экспорт метрик остановлен"
+
+def weather_task(args):
+    weather = task("task9_weather_parser")
+    if args.cache:
+        cache = weather.get_cache()
+        if cache is None or (cache.path, cache.ttl, cache.stale_ttl) != (args.cache, args.ttl, args.stale_ttl):
+            weather.configure_cache(ttl=args.ttl, stale_ttl=args.stale_ttl, path=args.cache)
+    return weather
+
+def weather_done(weather, result):
+    cache = weather.get_cache()
+    if cache is not None:
+        cache.wait_refreshes()
+    return result
+
+def weather_get(args):
+    weather = weather_task(args)
+    text, ошибка = weather_done(weather, weather.get_weather(args.city, args.format))
+    if text is None:
+        raise CommandError(f"Не удалось получить данные о погоде для города {args.city}: {ошибка}")
+    return text
+
+def _weather_results(cities, items, convert):
+    results = []
+    for city, (item, ошибка) in zip(cities, items):
+        if item is None:
+            results.append({'city': city, 'error': ошибка})
+        else:
+            results.append(convert(city, item))
+    if results and all('error' in result for result in results):
+        raise CommandError("; ".join(f"{result['city']}: {result['error']}" for result in results))
+    return results
+
+def weather_multi(args):
+    weather = weather_task(args)
+    items = weather_done(weather, weather.get_weather_concurrent(args.cities, 'short', args.workers, args.deadline))
+    return _weather_results(args.cities, items, lambda city, text: {'city': city, 'weather': text.strip()})
+
+def weather_report(args):
+    weather = weather_task(args)
+    report = importlib.import_module("task9_weather_parser.report")
+    items = weather_done(weather, weather.get_weather_reports(args.cities, args.workers, args.deadline))
+    return _weather_results(args.cities, items, lambda city, item: report.report_to_dict(item))
+
+def weather_poll(args):
+    scheduler = importlib.import_module("task9_weather_parser.scheduler")
+    cities = list(args.cities)
+    if args.cities_file:
+        with open(args.cities_file, encoding="utf-8") as f:
+            cities.extend(line.strip() for line in f if line.strip())
+    if not cities:
+        raise CommandError("Не указаны города!")
+    poller = scheduler.WeatherScheduler(
+        cities, args.format, args.interval, min(args.min_interval, args.interval),
+        max(args.max_interval, args.interval), args.budget, scheduler.WeatherStore(args.store)
+    )
+    try:
+        fetched = poller.run(args.duration)
+    except KeyboardInterrupt:
+        fetched = None
+    return {'fetched': fetched, 'store': args.store}
+
+def weather_history(args):
+    scheduler = importlib.import_module("task9_weather_parser.scheduler")
+    store = scheduler.WeatherStore(args.store)
+    if args.latest:
+        return store.latest()
+    since = time.time() - args.since * 60 if args.since else None
+    return list(store.records(args.city, since))
+
+def weather_stats(args):
+    weather = task("task9_weather_parser")
+    stats = weather.get_request_stats()
+    cache = weather.get_cache()
+    if cache is not None:
+        stats['cache'] = cache.stats()
+    return stats
+
+def html_task(args):
+    parser = task("task10_html_parser")
+    if args.cache:
+        cache = parser.get_cache()
+        if cache is None or cache.path != args.cache:
+            parser.configure_cache(args.cache, not args.no_index_cache)
+    return parser
+
+def html_info(args):
+    return html_task(args).get_page_info(load_page_cached(args))
+
+def html_title(args):
+    return html_task(args).get_page_title(load_page_cached(args))
+
+def html_headings(args):
+    return html_task(args).get_all_headings(load_page_cached(args), args.level)
+
+def html_links(args):
+    return html_task(args).get_all_links(load_page_cached(args))
+
+def html_images(args):
+    return html_task(args).get_all_images(load_page_cached(args))
+
+def html_paragraphs(args):
+    return html_task(args).get_all_paragraphs(load_page_cached(args))
+
+def html_tag(args):
+    return html_task(args).find_elements_by_tag(load_page_cached(args), args.tag.lower())
+
+def html_class(args):
+    return html_task(args).find_elements_by_class(load_page_cached(args), args.class_name)
+
+def html_select(args):
+    parser = html_task(args)
+    try:
+        task("task10_html_parser.selector").compile_selector(args.selector)
+    except ValueError as e:
+        raise CommandError(str(e))
+    return parser.select_elements(load_page_cached(args), args.selector)
+
+def html_search(args):
+    parser = html_task(args)
+    soup = load_page_cached(args)
+    found, message = parser.search_text_in_page(soup, args.text)
+    return {'found': found, 'message': message, **parser.search_page(soup, args.text, args.limit)}
+
+def html_stream(args):
+    max_size = int(args.max_size * 1024 * 1024) if args.max_size is not None else None
+    result, ошибка = task("task10_html_parser").extract_page_stream(full_url(args.url), args.only, max_size)
+    if result is None:
+        raise CommandError(ошибка)
+    return result
+
+def html_crawl(args):
+    parser = html_task(args)
+    crawler, ошибка = task("task10_html_parser.crawler").crawl(
+        full_url(args.url), args.max_pages, args.max_depth, args.workers, args.per_host, not args.ignore_robots)
+    if crawler is None:
+        raise CommandError(ошибка)
+    result = {'start': crawler.start_url, 'visited': len(crawler.visited), 'pages': crawler.results}
+    if args.search:
+        result['search'] = parser.build_search_index(crawler.pages).search(args.search)
+    return result
+
+def html_batch(args):
+    batch = task("task10_html_parser.batch")
+
+    def progress(pages, elapsed):
+        print(f"Обработано страниц: {pages} ({pages / elapsed:.1f} стр/с)", file=sys.stderr, flush=True)
+
+    if args.output == "-":
+        output = sys.stdout
+        args.result_stream = sys.stderr
+    else:
+        output = open(args.output, "w", encoding="utf-8")
+    try:
+        return batch.extract_files(args.sources, output, args.fields, args.workers, args.chunk_size,
+                                   progress=progress if args.progress else None)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+def backup_file(args):
+    return status_result(*task("task11_backup_system").backup_file(args.path))
+
+def backup_folder(args):
+    return status_result(*task("task11_backup_system").backup_folder(args.path, args.dest, args.incremental))
+
+def backup_ext(args):
+    return status_result(*task("task11_backup_system").backup_by_extension(args.folder, args.ext, args.dest))
+
+def backup_store(args):
+    return status_result(*task("task11_backup_system").backup_to_store(args.path, args.store))
+
+def backup_snapshots(args):
+    return task("task11_backup_system").list_store_snapshots(args.store)
+
+def backup_restore(args):
+    return status_result(*task("task11_backup_system").restore_from_store(args.name, args.target, args.store))
+
+def backup_forget(args):
+    require_confirmation(args)
+    return status_result(*task("task11_backup_system").delete_store_snapshot(args.name, args.store))
+
+def backup_gc(args):
+    return status_result(*task("task11_backup_system").collect_store_garbage(args.store))
+
+def backup_list(args):
+    return task("task11_backup_system").list_backups(args.dir)
+
+def clean_file(args):
+    require_confirmation(args)
+    return status_result(*task("task12_file_cleaner").safe_remove_file(args.path))
+
+def clean_folder(args):
+    require_confirmation(args)
+    return status_result(*task("task12_file_cleaner").safe_remove_folder(args.path))
+
+def clean_old(args):
+    require_confirmation(args)
+    if args.days <= 0:
+        raise CommandError("Количество дней должно быть положительным числом!")
+    return status_result(*task("task12_file_cleaner").remove_old_files(args.folder, args.days))
+
+def clean_empty(args):
+    require_confirmation(args)
+    return status_result(*task("task12_file_cleaner").safe_clean_folder(args.folder))
+
+def clean_trash(args):
+    return status_result(*task("task12_file_cleaner").move_to_trash(args.path, args.trash))
+
+def clean_ext(args):
+    require_confirmation(args)
+    return status_result(*task("task12_file_cleaner").remove_by_extension(args.folder, args.ext))
+
+def clean_list(args):
+    return task("task12_file_cleaner").list_files_in_folder(args.folder)
+
+def add_command(group, name, handler, help_text):
+    parser = group.add_parser(name, help=help_text)
+    parser.set_defaults(handler=handler)
+    return parser
+
+def build_parser():
+    parser = CommandParser(prog="main.py", description="Неинтерактивный запуск задач с выводом в JSON")
+    commands = parser.add_subparsers(dest="command", required=True, parser_class=CommandParser)
+
+    batch = commands.add_parser("batch", help="выполнить команды из файла (по одной в строке, '-' для stdin)")
+    batch.add_argument("file")
+
+    monitor = commands.add_parser("monitor", help="системный монитор").add_subparsers(dest="action", required=True, parser_class=CommandParser)
+    add_command(monitor, "system", monitor_system, "информация о системе")
+    add_command(monitor, "cpu", monitor_cpu, "загрузка CPU")
+    add_command(monitor, "memory", monitor_memory, "использование памяти")
+    add_command(monitor, "disk", monitor_disk, "использование дисков").add_argument("--timeout", type=float, default=2.0)
+    top = add_command(monitor, "top", monitor_top, "топ процессов")
+    top.add_argument("--by", choices=["cpu", "memory"], default="cpu")
+    top.add_argument("--count", type=int, default=10)
+    find = add_command(monitor, "find", monitor_find, "поиск процессов по имени")
+    find.add_argument("name")
+    details = add_command(monitor, "details", monitor_details, "детальная информация о процессе")
+    details.add_argument("pid", type=int)
+    listing = add_command(monitor, "list", monitor_list, "все процессы")
+    listing.add_argument("--limit", type=int, default=None)
+    watch = add_command(monitor, "watch", monitor_watch, "замеры памяти процессов и поиск утечек")
+    watch.add_argument("pids", type=int, nargs="+")
+    watch.add_argument("--duration", type=float, default=30.0)
+    watch.add_argument("--interval", type=float, default=0.5)
+    export = add_command(monitor, "export", monitor_export, "HTTP-экспорт метрик в формате OpenMetrics")
+    export.add_argument("--host", default="127.0.0.1")
+    export.add_argument("--port", type=int, default=9110)
+    export.add_argument("--interval", type=float, default=5.0)
+
+    weather = commands.add_parser("weather", help="парсер погоды").add_subparsers(dest="action", required=True, parser_class=CommandParser)
+    get = add_command(weather, "get", weather_get, "погода для одного города")
+    get.add_argument("city")
+    get.add_argument("--format", choices=["full", "short", "minimal"], default="short")
+    multi = add_command(weather, "multi", weather_multi, "погода для нескольких городов")
+    multi.add_argument("cities", nargs="+")
+    multi.add_argument("--workers", type=int, default=8)
+    multi.add_argument("--deadline", type=float, default=None)
+    report = add_command(weather, "report", weather_report, "структурированный прогноз (wttr.in format=j1)")
+    report.add_argument("cities", nargs="+")
+    report.add_argument("--workers", type=int, default=8)
+    report.add_argument("--deadline", type=float, default=None)
+    poll = add_command(weather, "poll", weather_poll, "периодически обновлять погоду для списка городов")
+    poll.add_argument("cities", nargs="*")
+    poll.add_argument("--cities-file", default=None)
+    poll.add_argument("--format", choices=["short", "minimal", "full", "json"], default="json")
+    poll.add_argument("--interval", type=float, default=1800.0, help="начальный интервал обновления города, сек")
+    poll.add_argument("--min-interval", type=float, default=600.0)
+    poll.add_argument("--max-interval", type=float, default=3 * 3600.0)
+    poll.add_argument("--budget", type=int, default=600, help="максимум запросов в час")
+    poll.add_argument("--store", default="weather_history.jsonl")
+    poll.add_argument("--duration", type=float, default=None, help="остановиться через N секунд")
+    history = add_command(weather, "history", weather_history, "записи из хранилища опроса")
+    history.add_argument("--store", default="weather_history.jsonl")
+    history.add_argument("--city", default=None)
+    history.add_argument("--since", type=float, default=None, help="за последние N минут")
+    history.add_argument("--latest", action="store_true", help="последнее значение по каждому городу")
+    add_command(weather, "stats", weather_stats, "счётчики запросов (объединённые, ограниченные, повторы)")
+    for command in (get, multi, report):
+        command.add_argument("--cache", default=None, help="файл SQLite для кэша ответов")
+        command.add_argument("--ttl", type=float, default=300.0, help="время жизни кэша, сек")
+        command.add_argument("--stale-ttl", type=float, default=0.0,
+                             help="сколько секунд после --ttl отдавать устаревший ответ и обновлять его перед выходом")
+
+    html = commands.add_parser("html", help="HTML парсер").add_subparsers(dest="action", required=True, parser_class=CommandParser)
+    for name, handler, help_text in [
+        ("info", html_info, "общая информация о странице"),
+        ("title", html_title, "заголовок страницы"),
+        ("links", html_links, "все ссылки"),
+        ("images", html_images, "все изображения"),
+        ("paragraphs", html_paragraphs, "все параграфы"),
+    ]:
+        add_command(html, name, handler, help_text).add_argument("url")
+    headings = add_command(html, "headings", html_headings, "заголовки h1-h6")
+    headings.add_argument("url")
+    headings.add_argument("--level", type=int, choices=range(1, 7), default=None)
+    tag = add_command(html, "tag", html_tag, "элементы по тегу")
+    tag.add_argument("url")
+    tag.add_argument("tag")
+    class_cmd = add_command(html, "class", html_class, "элементы по классу")
+    class_cmd.add_argument("url")
+    class_cmd.add_argument("class_name")
+    select = add_command(html, "select", html_select, "элементы по CSS-селектору (тег, .класс, #id, [атрибут], потомки)")
+    select.add_argument("url")
+    select.add_argument("selector")
+    stream = add_command(html, "stream", html_stream, "потоковое извлечение без построения дерева")
+    stream.add_argument("url")
+    stream.add_argument("--only", nargs="+", choices=["title", "headings", "links", "images"],
+                        default=["title", "headings", "links", "images"])
+    crawl = add_command(html, "crawl", html_crawl, "обход сайта по ссылкам")
+    crawl.add_argument("url")
+    crawl.add_argument("--max-pages", type=int, default=100)
+    crawl.add_argument("--max-depth", type=int, default=3)
+    crawl.add_argument("--workers", type=int, default=8)
+    crawl.add_argument("--per-host", type=int, default=4, help="одновременных запросов к одному хосту")
+    crawl.add_argument("--ignore-robots", action="store_true", help="не учитывать robots.txt")
+    crawl.add_argument("--search", default=None, help="поиск по обойдённым страницам")
+    batch = add_command(html, "batch", html_batch, "разбор сохранённых HTML-файлов в JSONL")
+    batch.add_argument("sources", nargs="+", help="файлы, папки или шаблоны ('archive/**/*.html')")
+    batch.add_argument("--output", default="-", help="файл JSONL (по умолчанию stdout)")
+    batch.add_argument("--fields", nargs="+", choices=["info", "title", "headings", "links", "images", "paragraphs"],
+                       default=["info"])
+    batch.add_argument("--workers", type=int, default=None, help="процессов (по умолчанию по числу CPU)")
+    batch.add_argument("--chunk-size", type=int, default=64, help="файлов в одной задаче")
+    batch.add_argument("--progress", action="store_true", help="печатать скорость в stderr")
+    search = add_command(html, "search", html_search, "поиск текста на странице")
+    search.add_argument("url")
+    search.add_argument("text", help='слова или фраза в кавычках: \'"точная фраза" слово\'')
+    search.add_argument("--limit", type=int, default=20, help="сколько совпадений показать")
+    for name, command in html.choices.items():
+        if name not in ("stream", "batch"):
+            command.add_argument("--cache", default=None, help="файл SQLite для кэша страниц (условные запросы)")
+            command.add_argument("--no-index-cache", action="store_true", help="не сохранять индекс разбора в кэше")
+        if name not in ("batch", "crawl"):
+            command.add_argument("--max-size", type=float, default=None, help="предельный размер страницы, МБ")
+        if name not in ("stream", "batch", "crawl"):
+            command.add_argument("--incremental", action="store_true",
+                                 help="разбирать по мере загрузки, без дерева BeautifulSoup")
+            command.add_argument("--skip", nargs="+", default=(), metavar="TAG",
+                                 help="не индексировать эти теги вместе с содержимым (с --incremental)")
+
+    backup = commands.add_parser("backup", help="резервное копирование").add_subparsers(dest="action", required=True, parser_class=CommandParser)
+    add_command(backup, "file", backup_file, "копия файла").add_argument("path")
+    folder = add_command(backup, "folder", backup_folder, "копия папки")
+    folder.add_argument("path")
+    folder.add_argument("--dest", default="backups")
+    folder.add_argument("--incremental", action="store_true",
+                        help="копировать только изменённые файлы, остальные - жёсткие ссылки на прошлую копию")
+    ext = add_command(backup, "ext", backup_ext, "копирование файлов по расширению")
+    ext.add_argument("folder")
+    ext.add_argument("--ext", default=".txt")
+    ext.add_argument("--dest", default="auto_backups")
+    add_command(backup, "list", backup_list, "список резервных копий").add_argument("--dir", default="backups")
+    store = add_command(backup, "store", backup_store, "снимок в хранилище с дедупликацией блоков")
+    store.add_argument("path")
+    snapshots = add_command(backup, "snapshots", backup_snapshots, "снимки в хранилище")
+    restore = add_command(backup, "restore", backup_restore, "восстановление снимка из хранилища")
+    restore.add_argument("name")
+    restore.add_argument("target")
+    forget = add_command(backup, "forget", backup_forget, "удаление снимка из хранилища")
+    forget.add_argument("name")
+    forget.add_argument("--yes", action="store_true")
+    gc = add_command(backup, "gc", backup_gc, "удаление блоков, на которые не ссылается ни один снимок")
+    for command in (store, snapshots, restore, forget, gc):
+        command.add_argument("--store", default="backup_store", help="папка хранилища")
+
+    clean = commands.add_parser("clean", help="очистка файлов").add_subparsers(dest="action", required=True, parser_class=CommandParser)
+    for name, handler, argument, help_text in [
+        ("file", clean_file, "path", "удалить файл"),
+        ("folder", clean_folder, "path", "удалить папку"),
+        ("empty", clean_empty, "folder", "очистить папку от содержимого"),
+    ]:
+        command = add_command(clean, name, handler, help_text)
+        command.add_argument(argument)
+        command.add_argument("--yes", action="store_true")
+    old = add_command(clean, "old", clean_old, "удалить старые файлы")
+    old.add_argument("folder")
+    old.add_argument("--days", type=int, required=True)
+    old.add_argument("--yes", action="store_true")
+    trash = add_command(clean, "trash", clean_trash, "переместить файл в корзину")
+    trash.add_argument("path")
+    trash.add_argument("--trash", default="trash")
+    clean_ext_cmd = add_command(clean, "ext", clean_ext, "удалить файлы по расширению")
+    clean_ext_cmd.add_argument("folder")
+    clean_ext_cmd.add_argument("ext")
+    clean_ext_cmd.add_argument("--yes", action="store_true")
+    add_command(clean, "list", clean_list, "файлы в папке").add_argument("folder")
+
+    return parser
+
+def execute(parser, argv):
+    try:
+        args = parser.parse_args(argv)
+        if args.command == "batch":
+            raise CommandError("вложенный batch не поддерживается")
+        result = args.handler(args)
+        return {'ok': True, 'result': result}, getattr(args, 'result_stream', None)
+    except CommandError as e:
+        return {'ok': False, 'error': str(e)}, None
+    except Exception as e:
+        return {'ok': False, 'error': f"Неожиданная ошибка: {str(e)}"}, None
+
+def emit(result, command=None, stream=None):
+    if command is not None:
+        result = {'command': command, **result}
+    print(json.dumps(result, ensure_ascii=False, default=str), file=stream or sys.stdout, flush=True)
+
+def run_batch(parser, path):
+    failed = 0
+    stream = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        for line in stream:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            output = None
+            try:
+                argv = shlex.split(line)
+                if "-h" in argv or "--help" in argv:
+                    raise CommandError("справка недоступна в batch")
+                result, output = execute(parser, argv)
+            except (ValueError, CommandError) as e:
+                result = {'ok': False, 'error': str(e)}
+            except SystemExit as e:
+                result = {'ok': False, 'error': f"команда завершилась досрочно (код {e.code})"}
+            if not result['ok']:
+                failed += 1
+            emit(result, line, output)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+    return 1 if failed else 0
+
+def main(argv=None):
+    parser = build_parser()
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in ("-h", "--help"):
+        parser.print_help()
+        return 0
+    if len(argv) >= 2 and argv[0] == "batch":
+        try:
+            return run_batch(parser, argv[1])
+        except OSError as e:
+            emit({'ok': False, 'error': str(e)})
+            return 1
+    result, output = execute(parser, argv)
+    emit(result, stream=output)
+    return 0 if result['ok'] else 1
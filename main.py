@@ -1,15 +1,36 @@
-import task1_calculator
-import task2_triangle_area
-import task3_cylinder_volume
-import task4_text_quest
-import task5_todo_list
-import task6_budget_calculator
-import task7_system_info
-import task8_system_monitor
-import task9_weather_parser
-import task10_html_parser
-import task11_backup_system
-import task12_file_cleaner
+import importlib
+import sys
+
+TASKS = [
+    ("1", "Калькулятор", "task1_calculator"),
+    ("2", "Площадь треугольника", "task2_triangle_area"),
+    ("3", "Объём цилиндра", "task3_cylinder_volume"),
+    ("4", "Текстовый квест", "task4_text_quest"),
+    ("5", "Список задач", "task5_todo_list"),
+    ("6", "Калькулятор бюджета", "task6_budget_calculator"),
+    ("7", "Информация о системе", "task7_system_info"),
+    ("8", "Системный монитор", "task8_system_monitor"),
+    ("9", "Парсер погоды", "task9_weather_parser"),
+    ("10", "HTML парсер", "task10_html_parser"),
+    ("11", "Резервное копирование", "task11_backup_system"),
+    ("12", "Очистка файлов", "task12_file_cleaner"),
+]
+
+TASKS_BY_KEY = {key: (title, module_name) for key, title, module_name in TASKS}
+
+def load_task(module_name):
+    try:
+        return importlib.import_module(module_name), None
+    except ImportError as e:
+        return None, f"Ошибка: не удалось загрузить задачу ({str(e)}). Установите зависимости: pip install -r requirements.txt"
+
+def run_task(key):
+    title, module_name = TASKS_BY_KEY[key]
+    module, ошибка = load_task(module_name)
+    if module is None:
+        print(f"\n{ошибка}")
+        return
+    module.run()
 
 def main():
     print("=" * 50)
@@ -18,53 +39,23 @@ def main():
     
     while True:
         print("\nВыберите задачу:")
-        print("1. Калькулятор")
-        print("2. Площадь треугольника")
-        print("3. Объём цилиндра")
-        print("4. Текстовый квест")
-        print("5. Список задач")
-        print("6. Калькулятор бюджета")
-        print("7. Информация о системе")
-        print("8. Системный монитор")
-        print("9. Парсер погоды")
-        print("10. HTML парсер")
-        print("11. Резервное копирование")
-        print("12. Очистка файлов")
+        for key, title, module_name in TASKS:
+            print(f"{key}. {title}")
         print("0. Выход")
         
         выбор = input("\nВведите номер задачи: ").strip()
         
-        if выбор == "1":
-            task1_calculator.run()
-        elif выбор == "2":
-            task2_triangle_area.run()
-        elif выбор == "3":
-            task3_cylinder_volume.run()
-        elif выбор == "4":
-            task4_text_quest.run()
-        elif выбор == "5":
-            task5_todo_list.run()
-        elif выбор == "6":
-            task6_budget_calculator.run()
-        elif выбор == "7":
-            task7_system_info.run()
-        elif выбор == "8":
-            task8_system_monitor.run()
-        elif выбор == "9":
-            task9_weather_parser.run()
-        elif выбор == "10":
-            task10_html_parser.run()
-        elif выбор == "11":
-            task11_backup_system.run()
-        elif выбор == "12":
-            task12_file_cleaner.run()
+        if выбор in TASKS_BY_KEY:
+            run_task(выбор)
         elif выбор == "0":
             print("\nСпасибо за использование программы!")
             print("До свидания!")
             break
         else:
-            print("\nНеверный выбор! Пожалуйста, выберите число от 0 до 12.")
+            print(f"\nНеверный выбор! Пожалуйста, выберите число от 0 до {len(TASKS)}.")
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        import cli
+        sys.exit(cli.main(sys.argv[1:]))
     main()
-
@@ -1,123 +1,219 @@
+import importlib.util
+import os
+import threading
+from email.message import Message
+
 import requests
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+from .index import PageIndex, build_index
+from .search import MAX_HITS, SearchIndex
+from .stream import CHUNK_SIZE, STREAM_KINDS, build_index_stream, extract, iter_text
+
+REQUEST_TIMEOUT = 10
+PARSER_BACKEND = os.environ.get('HTML_PARSER_BACKEND', 'auto')
+MAX_CONCURRENCY = 8
+MAX_PAGE_SIZE = int(os.environ.get('HTML_MAX_PAGE_SIZE', 64 * 1024 * 1024))
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=MAX_CONCURRENCY, pool_maxsize=MAX_CONCURRENCY)
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+        return _session
+
+def get_parser_backend(name=None):
+    name = name or PARSER_BACKEND
+    if name == 'auto':
+        return 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'
+    return name
+
+class PageTooLargeError(Exception):
+    pass
+
+def _error_message(e):
+    if isinstance(e, PageTooLargeError):
+        return f"Ошибка: страница больше {str(e)} байт."
+    if isinstance(e, requests.exceptions.Timeout):
+        return "Ошибка: Превышено время ожидания. Проверьте интернет-соединение."
+    if isinstance(e, requests.exceptions.ConnectionError):
+        return "Ошибка: Нет подключения к интернету."
+    if isinstance(e, requests.exceptions.InvalidURL):
+        return "Ошибка: Неверный URL адрес."
+    return f"Ошибка при загрузке страницы: {str(e)}"
+
+_cache = None
+
+def configure_cache(path, store_index=True):
+    global _cache
+    from .cache import PageCache
+    if _cache is not None:
+        _cache.close()
+    _cache = PageCache(path, store_index)
+    return _cache
+
+def disable_cache():
+    global _cache
+    if _cache is not None:
+        _cache.close()
+    _cache = None
 
-def load_page(url):
+def get_cache():
+    return _cache
+
+def _revalidated_page(cache, entry, parser):
+    index = cache.load_index(entry)
+    if index is not None:
+        cache.touch(entry.url)
+        return index
+    if not entry.body:
+        return None
+    soup = BeautifulSoup(entry.body.decode(entry.encoding or 'utf-8', 'replace'), get_parser_backend(parser))
+    cache.touch(entry.url, get_page_index(soup) if cache.store_index else None)
+    return soup
+
+def _declared_charset(response):
+    header = Message()
+    header['Content-Type'] = response.headers.get('Content-Type', '')
+    return header.get_param('charset')
+
+def _limited_content(response, max_size):
+    length = response.headers.get('Content-Length', '')
+    if max_size and length.isdigit() and int(length) > max_size:
+        raise PageTooLargeError(max_size)
+    received = 0
+    for chunk in response.iter_content(CHUNK_SIZE):
+        received += len(chunk)
+        if max_size and received > max_size:
+            raise PageTooLargeError(max_size)
+        yield chunk
+
+def _response_text(response, max_size):
+    return iter_text(_limited_content(response, max_size), _declared_charset(response))
+
+def load_page(url, parser=None, session=None, max_size=None, incremental=False, skip=()):
+    max_size = MAX_PAGE_SIZE if max_size is None else max_size
+    cache = get_cache()
     try:
-        response = requests.get(url, timeout=10)
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            return soup, None
-        else:
-            return None, f"Ошибка: статус код {response.status_code}"
-    except requests.exceptions.Timeout:
-        return None, "Ошибка: Превышено время ожидания. Проверьте интернет-соединение."
-    except requests.exceptions.ConnectionError:
-        return None, "Ошибка: Нет подключения к интернету."
-    except requests.exceptions.InvalidURL:
-        return None, "Ошибка: Неверный URL адрес."
+        entry = cache.get(url) if cache is not None else None
+        headers = cache.conditional_headers(entry) if cache is not None else None
+        with (session or requests).get(url, timeout=REQUEST_TIMEOUT, headers=headers, stream=True) as response:
+            if response.status_code == 304 and entry is not None:
+                page = _revalidated_page(cache, entry, parser)
+                if page is None:
+                    cache.discard(url)
+                    return load_page(url, parser, session, max_size, incremental, skip)
+                return page, None
+            if response.status_code != 200:
+                return None, f"Ошибка: статус код {response.status_code}"
+            if incremental:
+                page = build_index_stream(_response_text(response, max_size), skip)
+                text = None
+            else:
+                text = "".join(_response_text(response, max_size))
+                page = BeautifulSoup(text, get_parser_backend(parser))
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+        if cache is not None and text is not None and (etag or last_modified):
+            index = get_page_index(page) if cache.store_index else None
+            cache.put(url, etag, last_modified, text.encode('utf-8'), 'utf-8', index)
+        return page, None
+    except Exception as e:
+        return None, _error_message(e)
+
+def extract_page_stream(url, wanted=STREAM_KINDS, max_size=None):
+    max_size = MAX_PAGE_SIZE if max_size is None else max_size
+    try:
+        with requests.get(url, timeout=REQUEST_TIMEOUT, stream=True) as response:
+            if response.status_code != 200:
+                return None, f"Ошибка: статус код {response.status_code}"
+            return extract(_response_text(response, max_size), wanted), None
     except Exception as e:
-        return None, f"Ошибка при загрузке страницы: {str(e)}"
+        return None, _error_message(e)
+
+def get_page_index(soup):
+    if isinstance(soup, PageIndex):
+        return soup
+    index = soup.__dict__.get('_page_index')
+    if index is None:
+        index = build_index(soup)
+        soup.__dict__['_page_index'] = index
+    return index
 
 def get_page_title(soup):
     try:
-        title = soup.find('title')
-        if title:
-            return title.text.strip()
+        title = get_page_index(soup).title()
+        if title is not None:
+            return title
         return "Заголовок не найден"
     except Exception as e:
         return f"Ошибка: {str(e)}"
 
 def get_all_headings(soup, level=None):
     try:
-        if level:
-            headings = soup.find_all(f'h{level}')
-        else:
-            headings = soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
-        
-        result = []
-        for heading in headings:
-            result.append({
-                'tag': heading.name,
-                'text': heading.text.strip()
-            })
-        return result
+        return get_page_index(soup).headings(level)
     except Exception as e:
         return []
 
 def get_all_links(soup):
     try:
-        links = soup.find_all('a', href=True)
-        result = []
-        for link in links:
-            text = link.text.strip() if link.text else "Без текста"
-            href = link['href']
-            result.append({
-                'text': text,
-                'url': href
-            })
-        return result
+        return get_page_index(soup).links()
     except Exception as e:
         return []
 
 def find_elements_by_tag(soup, tag):
     try:
-        elements = soup.find_all(tag)
-        result = []
-        for elem in elements:
-            text = elem.text.strip()[:100] if elem.text else "Без текста"
-            result.append({
-                'tag': tag,
-                'text': text
-            })
-        return result
+        return get_page_index(soup).elements_by_tag(tag)
     except Exception as e:
         return []
 
 def find_elements_by_class(soup, class_name):
     try:
-        elements = soup.find_all(class_=class_name)
-        result = []
-        for elem in elements:
-            text = elem.text.strip()[:100] if elem.text else "Без текста"
-            result.append({
-                'tag': elem.name,
-                'text': text
-            })
-        return result
+        return get_page_index(soup).elements_by_class(class_name)
+    except Exception as e:
+        return []
+
+def select_elements(soup, selector):
+    try:
+        return get_page_index(soup).elements_by_selector(selector)
     except Exception as e:
         return []
 
 def get_all_images(soup):
     try:
-        images = soup.find_all('img', src=True)
-        result = []
-        for img in images:
-            src = img['src']
-            alt = img.get('alt', 'Без описания')
-            result.append({
-                'src': src,
-                'alt': alt
-            })
-        return result
+        return get_page_index(soup).images()
     except Exception as e:
         return []
 
 def get_all_paragraphs(soup):
     try:
-        paragraphs = soup.find_all('p')
-        result = []
-        for p in paragraphs:
-            text = p.text.strip()
-            if text:
-                result.append(text)
-        return result
+        return get_page_index(soup).paragraphs()
     except Exception as e:
         return []
 
+def search_page(soup, query, limit=MAX_HITS):
+    try:
+        return get_page_index(soup).text_index().search(query, limit)
+    except Exception as e:
+        return {'count': 0, 'hits': []}
+
+def build_search_index(pages):
+    return SearchIndex({url: get_page_index(page).text_index() for url, page in pages.items()})
+
 def search_text_in_page(soup, search_text):
     try:
-        text_content = soup.get_text()
-        if search_text.lower() in text_content.lower():
+        index = get_page_index(soup)
+        count = index.text_index().search(search_text, 0)['count']
+        if count:
+            return True, f"Текст '{search_text}' найден на странице (совпадений: {count})"
+        if search_text.lower() in index.lower_text():
             return True, f"Текст '{search_text}' найден на странице"
         else:
             return False, f"Текст '{search_text}' не найден на странице"
@@ -126,18 +222,21 @@ def search_text_in_page(soup, search_text):
 
 def get_page_info(soup):
     try:
+        index = get_page_index(soup)
         info = {
-            'title': get_page_title(soup),
-            'headings_count': len(get_all_headings(soup)),
-            'links_count': len(get_all_links(soup)),
-            'images_count': len(get_all_images(soup)),
-            'paragraphs_count': len(get_all_paragraphs(soup))
+            'title': get_page_title(index),
+            'headings_count': len(index.headings()),
+            'links_count': len(index.links()),
+            'images_count': len(index.images()),
+            'paragraphs_count': len(index.paragraphs())
         }
         return info
     except Exception as e:
         return None
 
 def run():
+    if get_cache() is None and os.environ.get("HTML_CACHE_PATH"):
+        configure_cache(os.environ["HTML_CACHE_PATH"])
     print("\n=== HTML Парсер ===")
     soup = None
     current_url = None
@@ -156,6 +255,8 @@ def run():
             print("9. Найти все параграфы")
             print("10. Поиск текста на странице")
             print("11. Общая информация о странице")
+            print("12. Обойти сайт, начиная с этой страницы")
+            print("13. Найти элементы по CSS-селектору")
         print("0. Назад")
         
         выбор = input("\nВыберите действие: ").strip()
@@ -265,6 +366,8 @@ def run():
                 found, message = search_text_in_page(soup, search_text)
                 print(f"\n=== Результат поиска ===")
                 print(message)
+                for i, hit in enumerate(search_page(soup, search_text, 10)['hits'], 1):
+                    print(f"{i}. {hit['snippet']}")
             else:
                 print("Текст для поиска не может быть пустым!")
             input("\nНажмите Enter для продолжения...")
@@ -280,6 +383,52 @@ def run():
                 print(f"Параграфов: {info['paragraphs_count']}")
             input("\nНажмите Enter для продолжения...")
             
+        elif выбор == "12" and soup:
+            from .crawler import CRAWL_MAX_PAGES, crawl
+            try:
+                max_pages = int(input(f"Максимум страниц [{CRAWL_MAX_PAGES}]: ").strip() or CRAWL_MAX_PAGES)
+            except ValueError:
+                max_pages = CRAWL_MAX_PAGES
+            print("\nОбход сайта...")
+            crawler, ошибка = crawl(current_url, max_pages)
+            if crawler:
+                print(f"\n=== Обход сайта (страниц: {len(crawler.pages)}) ===")
+                for page in crawler.results:
+                    if page['error']:
+                        print(f"[{page['depth']}] {page['url']} - {page['error']}")
+                    else:
+                        print(f"[{page['depth']}] {page['url']} - {page['title'] or 'Без заголовка'}")
+                query = input("\nПоиск по найденным страницам (Enter - пропустить): ").strip()
+                if query:
+                    results = build_search_index(crawler.pages).search(query)
+                    print(f"\n=== Результаты поиска (страниц: {len(results)}) ===")
+                    for result in results:
+                        print(f"{result['url']} (совпадений: {result['count']})")
+                        for hit in result['hits']:
+                            print(f"   {hit['snippet']}")
+            else:
+                print(ошибка)
+            input("\nНажмите Enter для продолжения...")
+            
+        elif выбор == "13" and soup:
+            from .selector import compile_selector
+            selector = input("Введите селектор (например: div.news > a[href^=\"http\"]): ").strip()
+            if selector:
+                try:
+                    compile_selector(selector)
+                except ValueError as e:
+                    print(f"Ошибка: {str(e)}")
+                else:
+                    elements = select_elements(soup, selector)
+                    print(f"\n=== Элементы '{selector}' (найдено: {len(elements)}) ===")
+                    for i, elem in enumerate(elements[:20], 1):
+                        print(f"{i}. [{elem['tag']}] {elem['text']}")
+                    if len(elements) > 20:
+                        print(f"... и ещё {len(elements) - 20} элементов")
+            else:
+                print("Селектор не может быть пустым!")
+            input("\nНажмите Enter для продолжения...")
+            
         elif выбор == "0":
             break
         else:
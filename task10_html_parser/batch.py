@@ -0,0 +1,100 @@
+import glob
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from bs4 import BeautifulSoup
+
+from . import (
+    get_all_headings, get_all_images, get_all_links, get_all_paragraphs,
+    get_page_index, get_page_info, get_page_title, get_parser_backend
+)
+
+HTML_EXTENSIONS = ('.html', '.htm')
+BATCH_CHUNK_SIZE = 64
+EXTRACTORS = {
+    'info': get_page_info,
+    'title': get_page_title,
+    'headings': get_all_headings,
+    'links': get_all_links,
+    'images': get_all_images,
+    'paragraphs': get_all_paragraphs
+}
+
+def iter_html_files(sources):
+    for source in sources:
+        if os.path.isdir(source):
+            for root, dirs, files in os.walk(source):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.lower().endswith(HTML_EXTENSIONS):
+                        yield os.path.join(root, name)
+        elif any(char in source for char in '*?['):
+            for path in glob.iglob(source, recursive=True):
+                if os.path.isfile(path):
+                    yield path
+        else:
+            yield source
+
+def extract_file(path, fields=('info',), parser=None):
+    try:
+        with open(path, 'rb') as f:
+            content = f.read()
+    except OSError as e:
+        return {'path': path, 'error': f"Ошибка чтения файла: {str(e)}"}
+    try:
+        index = get_page_index(BeautifulSoup(content, get_parser_backend(parser)))
+    except Exception as e:
+        return {'path': path, 'error': f"Ошибка разбора: {str(e)}"}
+    record = {'path': path}
+    for field in fields:
+        record[field] = EXTRACTORS[field](index)
+    return record
+
+def _extract_chunk(paths, fields, parser):
+    return [extract_file(path, fields, parser) for path in paths]
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def extract_files(sources, output, fields=('info',), workers=None, chunk_size=BATCH_CHUNK_SIZE, parser=None,
+                  progress=None):
+    workers = workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    pages = 0
+    errors = 0
+
+    def write(records):
+        nonlocal pages, errors
+        for record in records:
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            pages += 1
+            if 'error' in record:
+                errors += 1
+        if progress is not None:
+            progress(pages, time.perf_counter() - started)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in _chunks(iter_html_files(sources), chunk_size):
+            pending.append(executor.submit(_extract_chunk, chunk, tuple(fields), parser))
+            if len(pending) >= workers * 2:
+                write(pending.popleft().result())
+        while pending:
+            write(pending.popleft().result())
+    output.flush()
+    elapsed = time.perf_counter() - started
+    return {
+        'pages': pages,
+        'errors': errors,
+        'seconds': round(elapsed, 3),
+        'pages_per_second': round(pages / elapsed, 1) if elapsed > 0 else None
+    }
@@ -0,0 +1,104 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+CachedPage = namedtuple('CachedPage', 'url etag last_modified body encoding page_index fetched_at')
+
+class PageCache:
+    def __init__(self, path, store_index=True):
+        self.path = path
+        self.store_index = store_index
+        self._lock = threading.Lock()
+        self.revalidated = 0
+        self.index_hits = 0
+        self.misses = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, body BLOB NOT NULL, encoding TEXT, "
+            "page_index BLOB, fetched_at REAL NOT NULL)"
+        )
+        self._db.commit()
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def get(self, url):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT url, etag, last_modified, body, encoding, page_index, fetched_at FROM pages WHERE url = ?",
+                (url,)
+            ).fetchone()
+        return CachedPage(*row) if row is not None else None
+
+    def conditional_headers(self, entry):
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def load_index(self, entry):
+        if entry.page_index is None:
+            return None
+        try:
+            index = pickle.loads(entry.page_index)
+        except Exception:
+            return None
+        with self._lock:
+            self.index_hits += 1
+        return index
+
+    def put(self, url, etag, last_modified, body, encoding, index=None):
+        blob = pickle.dumps(index, pickle.HIGHEST_PROTOCOL) if index is not None and self.store_index else None
+        with self._lock:
+            self.misses += 1
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages (url, etag, last_modified, body, encoding, page_index, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, body, encoding, blob, time.time())
+            )
+            self._db.commit()
+
+    def touch(self, url, index=None):
+        with self._lock:
+            self.revalidated += 1
+            if index is not None and self.store_index:
+                self._db.execute(
+                    "UPDATE pages SET page_index = ?, fetched_at = ? WHERE url = ?",
+                    (pickle.dumps(index, pickle.HIGHEST_PROTOCOL), time.time(), url)
+                )
+            else:
+                self._db.execute("UPDATE pages SET fetched_at = ? WHERE url = ?", (time.time(), url))
+            self._db.commit()
+
+    def discard(self, url):
+        with self._lock:
+            self._db.execute("DELETE FROM pages WHERE url = ?", (url,))
+            self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM pages")
+            self._db.commit()
+
+    def stats(self):
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+            return {
+                'entries': entries,
+                'revalidated': self.revalidated,
+                'index_hits': self.index_hits,
+                'misses': self.misses
+            }
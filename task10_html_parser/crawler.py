@@ -0,0 +1,161 @@
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urljoin, urlsplit, urlunsplit
+from urllib.robotparser import RobotFileParser
+
+import requests
+
+from . import MAX_CONCURRENCY, REQUEST_TIMEOUT, get_page_index, get_session, load_page
+
+CRAWL_MAX_PAGES = 100
+CRAWL_MAX_DEPTH = 3
+CRAWL_PER_HOST = 4
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+SKIP_EXTENSIONS = (
+    '.jpg', '.jpeg', '.png', '.gif', '.svg', '.webp', '.ico', '.css', '.js',
+    '.pdf', '.zip', '.gz', '.tar', '.mp3', '.mp4', '.avi', '.exe'
+)
+ROBOTS_ERROR = "Запрещено правилами robots.txt"
+
+def normalize_url(url, base=None):
+    if base is not None:
+        url = urljoin(base, url)
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return None
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS or not parts.hostname:
+        return None
+    host = parts.hostname
+    if ':' in host:
+        host = f"[{host}]"
+    if port is not None and port != DEFAULT_PORTS[scheme]:
+        host = f"{host}:{port}"
+    return urlunsplit((scheme, host, parts.path or '/', parts.query, ''))
+
+class RobotsCache:
+    def __init__(self, session):
+        self.session = session
+        self.user_agent = session.headers.get('User-Agent', '*')
+        self._parsers = {}
+        self._lock = threading.Lock()
+
+    def _load(self, origin):
+        parser = RobotFileParser(origin + '/robots.txt')
+        try:
+            response = self.session.get(parser.url, timeout=REQUEST_TIMEOUT)
+        except requests.exceptions.RequestException:
+            parser.allow_all = True
+            return parser
+        if response.status_code in (401, 403) or response.status_code >= 500:
+            parser.disallow_all = True
+        elif response.status_code >= 400:
+            parser.allow_all = True
+        else:
+            parser.parse(response.text.splitlines())
+        return parser
+
+    def allowed(self, url):
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        with self._lock:
+            parser = self._parsers.get(origin)
+            if parser is None:
+                parser = self._parsers[origin] = self._load(origin)
+        return parser.can_fetch(self.user_agent, url)
+
+class Crawler:
+    def __init__(self, start_url, max_pages=CRAWL_MAX_PAGES, max_depth=CRAWL_MAX_DEPTH, max_workers=MAX_CONCURRENCY,
+                 per_host=CRAWL_PER_HOST, respect_robots=True, hosts=None, session=None):
+        start = normalize_url(start_url)
+        if start is None:
+            raise ValueError("Неверный URL адрес.")
+        self.start_url = start
+        self.max_pages = max_pages
+        self.max_depth = max_depth
+        self.max_workers = max(1, max_workers)
+        self.per_host = max(1, per_host)
+        self.hosts = set(hosts or [urlsplit(start).netloc])
+        self.session = session or get_session()
+        self.robots = RobotsCache(self.session) if respect_robots else None
+        self.pages = {}
+        self.results = []
+        self.visited = {start}
+        self._frontier = deque([(start, 0)])
+        self._active = {}
+
+    def _accept(self, url):
+        parts = urlsplit(url)
+        return parts.netloc in self.hosts and not parts.path.lower().endswith(SKIP_EXTENSIONS)
+
+    def _fetch(self, url, depth):
+        soup, ошибка = load_page(url, session=self.session)
+        if soup is None:
+            return url, depth, None, ошибка
+        return url, depth, get_page_index(soup), None
+
+    def _next(self):
+        for _ in range(len(self._frontier)):
+            url, depth = self._frontier.popleft()
+            if self.robots is not None and not self.robots.allowed(url):
+                self.results.append({'url': url, 'depth': depth, 'error': ROBOTS_ERROR})
+                continue
+            host = urlsplit(url).netloc
+            if self._active.get(host, 0) < self.per_host:
+                return url, depth, host
+            self._frontier.append((url, depth))
+        return None
+
+    def _record(self, url, depth, index, ошибка):
+        page = {'url': url, 'depth': depth, 'error': ошибка}
+        if index is not None:
+            self.pages[url] = index
+            links = index.links()
+            page['title'] = index.title()
+            page['links_count'] = len(links)
+            if depth < self.max_depth:
+                for link in links:
+                    target = normalize_url(link['url'], url)
+                    if target is None or target in self.visited or not self._accept(target):
+                        continue
+                    self.visited.add(target)
+                    self._frontier.append((target, depth + 1))
+        self.results.append(page)
+
+    def run(self):
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        pending = {}
+        scheduled = 0
+        try:
+            while True:
+                while scheduled < self.max_pages and len(pending) < self.max_workers:
+                    item = self._next()
+                    if item is None:
+                        break
+                    url, depth, host = item
+                    self._active[host] = self._active.get(host, 0) + 1
+                    pending[executor.submit(self._fetch, url, depth)] = host
+                    scheduled += 1
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self._active[pending.pop(future)] -= 1
+                    self._record(*future.result())
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+        return self.results
+
+def crawl(start_url, max_pages=CRAWL_MAX_PAGES, max_depth=CRAWL_MAX_DEPTH, max_workers=MAX_CONCURRENCY,
+          per_host=CRAWL_PER_HOST, respect_robots=True):
+    try:
+        crawler = Crawler(start_url, max_pages, max_depth, max_workers, per_host, respect_robots)
+    except ValueError as e:
+        return None, f"Ошибка: {str(e)}"
+    crawler.run()
+    return crawler, None
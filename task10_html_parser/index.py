@@ -0,0 +1,209 @@
+import re
+from array import array
+
+from .search import TextIndex
+from .selector import compile_selector
+
+HEADING_TAGS = ('h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+OWN_TEXT_TAGS = ('script', 'style', 'template')
+NO_ATTRS = {}
+INLINE_TAGS = frozenset((
+    'a', 'abbr', 'b', 'bdi', 'bdo', 'cite', 'code', 'data', 'dfn', 'em', 'font', 'i', 'kbd', 'mark', 'q', 's',
+    'samp', 'small', 'span', 'strong', 'sub', 'sup', 'time', 'u', 'var'
+))
+NON_SPACE_RE = re.compile(r'\S')
+
+class PageIndex:
+    def __init__(self):
+        self.names = []
+        self.parents = array('i')
+        self.starts = array('i')
+        self.ends = array('i')
+        self.attrs = []
+        self.own_text = {}
+        self.by_tag = {}
+        self.by_class = {}
+        self.by_id = {}
+        self.text = ""
+        self.breaks = array('i')
+        self._parts = []
+        self._length = 0
+        self._cache = {}
+
+    def _break(self):
+        if not self.breaks or self.breaks[-1] != self._length:
+            self.breaks.append(self._length)
+
+    def open(self, name, attrs, parent=-1):
+        if name not in INLINE_TAGS:
+            self._break()
+        position = len(self.names)
+        self.names.append(name)
+        self.parents.append(parent)
+        self.starts.append(self._length)
+        self.ends.append(self._length)
+        self.attrs.append(attrs or NO_ATTRS)
+        self.by_tag.setdefault(name, []).append(position)
+        if attrs:
+            classes = attrs.get('class')
+            if classes:
+                if isinstance(classes, str):
+                    classes = classes.split()
+                for class_name in classes:
+                    self.by_class.setdefault(class_name, []).append(position)
+            element_id = attrs.get('id')
+            if element_id:
+                self.by_id.setdefault(element_id, []).append(position)
+        return position
+
+    def close(self, position):
+        self.ends[position] = self._length
+        if self.names[position] not in INLINE_TAGS:
+            self._break()
+
+    def add_text(self, text):
+        self._parts.append(text)
+        self._length += len(text)
+
+    def finish(self):
+        self.text = "".join(self._parts)
+        self._parts = []
+        return self
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_cache'] = {}
+        return state
+
+    def element_text(self, position):
+        text = self.own_text.get(position)
+        if text is not None:
+            return text
+        return self.text[self.starts[position]:self.ends[position]]
+
+    def classes(self, position):
+        classes = self.attrs[position].get('class') or []
+        return classes.split() if isinstance(classes, str) else classes
+
+    def _memo(self, key, build):
+        result = self._cache.get(key)
+        if result is None:
+            result = self._cache[key] = build()
+        return result
+
+    def lower_text(self):
+        return self._memo('lower_text', self.text.lower)
+
+    def text_index(self):
+        return self._memo('text_index', lambda: TextIndex(self.text, getattr(self, 'breaks', ())))
+
+    def title(self):
+        positions = self.by_tag.get('title')
+        if not positions:
+            return None
+        return self.element_text(positions[0]).strip()
+
+    def headings(self, level=None):
+        def build():
+            if level:
+                positions = self.by_tag.get(f'h{level}', [])
+            else:
+                positions = sorted(p for tag in HEADING_TAGS for p in self.by_tag.get(tag, []))
+            return [{'tag': self.names[p], 'text': self.element_text(p).strip()} for p in positions]
+        return self._memo(('headings', level), build)
+
+    def links(self):
+        def build():
+            result = []
+            for p in self.by_tag.get('a', []):
+                href = self.attrs[p].get('href')
+                if href is None:
+                    continue
+                text = self.element_text(p)
+                result.append({'text': text.strip() if text else "Без текста", 'url': href})
+            return result
+        return self._memo('links', build)
+
+    def images(self):
+        def build():
+            result = []
+            for p in self.by_tag.get('img', []):
+                src = self.attrs[p].get('src')
+                if src is None:
+                    continue
+                result.append({'src': src, 'alt': self.attrs[p].get('alt', 'Без описания')})
+            return result
+        return self._memo('images', build)
+
+    def paragraphs(self):
+        def build():
+            result = []
+            for p in self.by_tag.get('p', []):
+                text = self.element_text(p).strip()
+                if text:
+                    result.append(text)
+            return result
+        return self._memo('paragraphs', build)
+
+    def preview(self, position, limit=100):
+        text = self.own_text.get(position)
+        if text is not None:
+            return text.strip()[:limit] if text else "Без текста"
+        start, end = self.starts[position], self.ends[position]
+        if start == end:
+            return "Без текста"
+        first = NON_SPACE_RE.search(self.text, start, end)
+        if first is None:
+            return ""
+        start = first.start()
+        text = self.text[start:min(end, start + limit)]
+        if start + limit >= end or NON_SPACE_RE.search(self.text, start + limit, end) is None:
+            text = text.rstrip()
+        return text
+
+    def elements_by_tag(self, tag):
+        return self._memo(('tag', tag), lambda: [
+            {'tag': tag, 'text': self.preview(p)} for p in self.by_tag.get(tag, [])
+        ])
+
+    def class_positions(self, class_name):
+        tokens = class_name.split()
+        if len(tokens) == 1:
+            return self.by_class.get(tokens[0], [])
+        if not tokens:
+            return []
+        return [p for p in self.by_class.get(tokens[0], []) if " ".join(self.classes(p)) == class_name]
+
+    def elements_by_class(self, class_name):
+        return self._memo(('class', class_name), lambda: [
+            {'tag': self.names[p], 'text': self.preview(p)} for p in self.class_positions(class_name)
+        ])
+
+    def select(self, selector):
+        return self._memo(('select', selector), lambda: compile_selector(selector).select(self))
+
+    def elements_by_selector(self, selector):
+        return self._memo(('select_elements', selector), lambda: [
+            {'tag': self.names[p], 'text': self.preview(p)} for p in self.select(selector)
+        ])
+
+def build_index(soup):
+    index = PageIndex()
+    interesting = soup.interesting_string_types
+    stack = [(iter(soup.contents), -1)]
+    while stack:
+        children, parent = stack[-1]
+        node = next(children, None)
+        if node is None:
+            stack.pop()
+            if parent >= 0:
+                index.close(parent)
+            continue
+        if node.name is not None:
+            position = index.open(node.name, node.attrs, parent)
+            if node.name in OWN_TEXT_TAGS:
+                index.own_text[position] = node.get_text()
+            stack.append((iter(node.contents), position))
+        elif type(node) in interesting:
+            index.add_text(node)
+    return index.finish()
@@ -0,0 +1,129 @@
+import math
+import re
+from array import array
+from bisect import bisect_left
+
+TOKEN_RE = re.compile(r'\w+')
+QUERY_RE = re.compile(r'"([^"]*)"|(\S+)')
+SNIPPET_WIDTH = 60
+MAX_HITS = 20
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+def tokenize(text, breaks=()):
+    start = 0
+    for end in (*breaks, len(text)):
+        if end > start:
+            for match in TOKEN_RE.finditer(text, start, end):
+                yield match.group().lower(), match.start(), match.end()
+            start = end
+
+def parse_query(query):
+    clauses = []
+    for phrase, word in QUERY_RE.findall(query):
+        terms = tuple(term for term, start, end in tokenize(phrase or word))
+        if terms and terms not in clauses:
+            clauses.append(terms)
+    return clauses
+
+def _contains(postings, value):
+    i = bisect_left(postings, value)
+    return i < len(postings) and postings[i] == value
+
+class TextIndex:
+    def __init__(self, text, breaks=()):
+        self.text = text
+        self.starts = array('l')
+        self.ends = array('l')
+        self.postings = {}
+        for position, (term, start, end) in enumerate(tokenize(text, breaks)):
+            self.starts.append(start)
+            self.ends.append(end)
+            self.postings.setdefault(term, []).append(position)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def match(self, terms):
+        lists = [self.postings.get(term) for term in terms]
+        if not all(lists):
+            return []
+        if len(terms) == 1:
+            return lists[0]
+        anchor = min(range(len(terms)), key=lambda i: len(lists[i]))
+        result = []
+        for p in lists[anchor]:
+            start = p - anchor
+            if start >= 0 and all(i == anchor or _contains(lists[i], start + i) for i in range(len(terms))):
+                result.append(start)
+        return result
+
+    def spans(self, clauses):
+        matches = [self.match(terms) for terms in clauses]
+        if not clauses or not all(matches):
+            return []
+        return sorted(
+            (self.starts[p], self.ends[p + len(terms) - 1])
+            for terms, found in zip(clauses, matches) for p in found
+        )
+
+    def snippet(self, start, end, width=SNIPPET_WIDTH):
+        left = max(0, start - width)
+        right = min(len(self.text), end + width)
+        snippet = " ".join(f"{self.text[left:start]}[{self.text[start:end]}]{self.text[end:right]}".split())
+        return ("..." if left else "") + snippet + ("..." if right < len(self.text) else "")
+
+    def search(self, query, limit=MAX_HITS):
+        spans = self.spans(parse_query(query))
+        return {
+            'count': len(spans),
+            'hits': [{'position': start, 'snippet': self.snippet(start, end)} for start, end in spans[:limit]]
+        }
+
+class SearchIndex:
+    def __init__(self, pages=None):
+        self.pages = {}
+        self.documents = {}
+        self._tokens = 0
+        for url, index in (pages or {}).items():
+            self.add(url, index)
+
+    def add(self, url, index):
+        if url in self.pages:
+            return
+        self.pages[url] = index
+        self._tokens += len(index)
+        for term in index.postings:
+            self.documents.setdefault(term, set()).add(url)
+
+    def search(self, query, limit=10, hits=3):
+        clauses = parse_query(query)
+        if not clauses or not self.pages:
+            return []
+        term_sets = sorted((self.documents.get(term, set()) for terms in clauses for term in terms), key=len)
+        candidates = set.intersection(*term_sets) if term_sets[0] else set()
+        matched = []
+        for url in candidates:
+            index = self.pages[url]
+            counts = [len(index.match(terms)) for terms in clauses]
+            if all(counts):
+                matched.append((url, counts))
+        if not matched:
+            return []
+        total = len(self.pages)
+        average = self._tokens / total or 1
+        frequencies = [len(set.intersection(*(self.documents[term] for term in terms))) for terms in clauses]
+        ranked = []
+        for url, counts in matched:
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * len(self.pages[url]) / average)
+            score = sum(
+                math.log(1 + (total - df + 0.5) / (df + 0.5)) * tf * (BM25_K1 + 1) / (tf + norm)
+                for tf, df in zip(counts, frequencies)
+            )
+            ranked.append((score, url))
+        ranked.sort(key=lambda item: (-item[0], item[1]))
+        results = []
+        for score, url in ranked[:limit]:
+            found = self.pages[url].search(query, hits)
+            results.append({'url': url, 'score': round(score, 4), 'count': found['count'], 'hits': found['hits']})
+        return results
@@ -0,0 +1,147 @@
+import re
+import threading
+
+SELECTOR_CACHE_SIZE = 256
+PART_RE = re.compile(r'''
+    (?P<tag>-?[_a-zA-Z][-\w]*|\*)
+  | \#(?P<id>[-\w]+)
+  | \.(?P<class_name>[-\w]+)
+  | \[\s*(?P<attr>[-\w:]+)\s*
+      (?:(?P<op>[~|^$*]?=)\s*(?:"(?P<dq>[^"]*)"|'(?P<sq>[^']*)'|(?P<bare>[^\s\]'"]+))\s*)?\]
+  | (?P<combinator>\s*[>,]\s*|\s+)
+''', re.VERBOSE)
+
+def _attr_matches(value, op, expected):
+    if value is None:
+        return False
+    if not isinstance(value, str):
+        value = " ".join(value)
+    if op is None:
+        return True
+    if op == '=':
+        return value == expected
+    if op == '~=':
+        return expected in value.split()
+    if op == '|=':
+        return value == expected or value.startswith(expected + '-')
+    if not expected:
+        return False
+    if op == '^=':
+        return value.startswith(expected)
+    if op == '$=':
+        return value.endswith(expected)
+    return expected in value
+
+class Compound:
+    def __init__(self):
+        self.tag = None
+        self.universal = False
+        self.element_id = None
+        self.classes = []
+        self.attrs = []
+
+    def __bool__(self):
+        return bool(self.universal or self.tag or self.element_id or self.classes or self.attrs)
+
+    def candidates(self, index):
+        if self.element_id is not None:
+            return index.by_id.get(self.element_id, [])
+        if self.classes:
+            return min((index.by_class.get(name, []) for name in self.classes), key=len)
+        if self.tag is not None:
+            return index.by_tag.get(self.tag, [])
+        return range(len(index.names))
+
+    def matches(self, index, position):
+        if self.tag is not None and index.names[position] != self.tag:
+            return False
+        attrs = index.attrs[position]
+        if self.element_id is not None and attrs.get('id') != self.element_id:
+            return False
+        if self.classes:
+            classes = index.classes(position)
+            if any(name not in classes for name in self.classes):
+                return False
+        return all(_attr_matches(attrs.get(name), op, expected) for name, op, expected in self.attrs)
+
+class Selector:
+    def __init__(self, text):
+        self.text = text
+        self.chains = []
+        chain = []
+        compound = Compound()
+        combinator = None
+        position = 0
+        text = text.strip()
+        while position < len(text):
+            match = PART_RE.match(text, position)
+            if match is None:
+                raise ValueError(f"Неподдерживаемый селектор: {text[position:]!r}")
+            position = match.end()
+            kind = match.lastgroup
+            if kind == 'combinator':
+                if not compound:
+                    raise ValueError(f"Пустая часть селектора: {self.text!r}")
+                chain.append((combinator, compound))
+                compound = Compound()
+                combinator = match.group().strip() or ' '
+                if combinator == ',':
+                    self.chains.append(chain)
+                    chain = []
+                    combinator = None
+            elif kind == 'tag':
+                if compound:
+                    raise ValueError(f"Тег должен стоять в начале: {match.group()!r}")
+                if match.group() == '*':
+                    compound.universal = True
+                else:
+                    compound.tag = match.group().lower()
+            elif kind == 'id':
+                compound.element_id = match.group('id')
+            elif kind == 'class_name':
+                compound.classes.append(match.group('class_name'))
+            else:
+                expected = next((v for v in match.group('dq', 'sq', 'bare') if v is not None), None)
+                compound.attrs.append((match.group('attr').lower(), match.group('op'), expected))
+        if not compound:
+            raise ValueError(f"Пустая часть селектора: {self.text!r}")
+        chain.append((combinator, compound))
+        self.chains.append(chain)
+
+    def _match_ancestors(self, index, chain, step, position):
+        if step == 0:
+            return True
+        combinator = chain[step][0]
+        compound = chain[step - 1][1]
+        parent = index.parents[position]
+        while parent >= 0:
+            if compound.matches(index, parent) and self._match_ancestors(index, chain, step - 1, parent):
+                return True
+            if combinator == '>':
+                return False
+            parent = index.parents[parent]
+        return False
+
+    def select(self, index):
+        found = set()
+        for chain in self.chains:
+            last = len(chain) - 1
+            compound = chain[last][1]
+            for position in compound.candidates(index):
+                if compound.matches(index, position) and self._match_ancestors(index, chain, last, position):
+                    found.add(position)
+        return sorted(found)
+
+_compiled = {}
+_compiled_lock = threading.Lock()
+
+def compile_selector(text):
+    with _compiled_lock:
+        selector = _compiled.get(text)
+    if selector is None:
+        selector = Selector(text)
+        with _compiled_lock:
+            if len(_compiled) >= SELECTOR_CACHE_SIZE:
+                _compiled.pop(next(iter(_compiled)))
+            _compiled[text] = selector
+    return selector
@@ -0,0 +1,240 @@
+import codecs
+import re
+from html.parser import HTMLParser
+
+from .index import HEADING_TAGS, OWN_TEXT_TAGS, PageIndex
+
+STREAM_KINDS = ('title', 'headings', 'links', 'images')
+SKIP_TAGS = ('script', 'style', 'template')
+CHUNK_SIZE = 64 * 1024
+SNIFF_SIZE = 4096
+META_CHARSET_RE = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([-\w.:]+)', re.IGNORECASE)
+VOID_TAGS = frozenset((
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'param', 'source', 'track', 'wbr'
+))
+
+class StreamExtractor(HTMLParser):
+    def __init__(self, wanted=STREAM_KINDS):
+        super().__init__(convert_charrefs=True)
+        self.wanted = set(wanted)
+        self.items = []
+        self._open = []
+        self._skip = 0
+
+    def _capture(self, tag):
+        if tag == 'title':
+            return 'title' in self.wanted
+        if tag == 'a':
+            return 'links' in self.wanted
+        return tag in HEADING_TAGS and 'headings' in self.wanted
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self._skip += 1
+            return
+        if tag == 'img':
+            if 'images' in self.wanted:
+                attrs = dict(attrs)
+                if attrs.get('src') is not None:
+                    self.items.append({'type': 'image', 'src': attrs['src'], 'alt': attrs.get('alt', 'Без описания')})
+            return
+        if not self._capture(tag):
+            return
+        if tag == 'a':
+            href = dict(attrs).get('href')
+            if href is None:
+                return
+            self._open.append([tag, [], href])
+        else:
+            self._open.append([tag, [], None])
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+            return
+        for position in range(len(self._open) - 1, -1, -1):
+            if self._open[position][0] == tag:
+                while len(self._open) > position:
+                    self._emit(self._open.pop())
+                return
+
+    def handle_data(self, data):
+        if self._skip:
+            return
+        for record in self._open:
+            record[1].append(data)
+
+    def _emit(self, record):
+        tag, parts, href = record
+        text = "".join(parts)
+        if tag == 'a':
+            self.items.append({'type': 'link', 'text': text.strip() if text else "Без текста", 'url': href})
+        elif tag == 'title':
+            self.items.append({'type': 'title', 'text': text.strip()})
+        else:
+            self.items.append({'type': 'heading', 'tag': tag, 'text': text.strip()})
+
+    def pop_items(self):
+        items = self.items
+        self.items = []
+        return items
+
+    def close(self):
+        super().close()
+        while self._open:
+            self._emit(self._open.pop())
+
+def sniff_charset(head):
+    for bom, encoding in ((codecs.BOM_UTF8, 'utf-8-sig'), (codecs.BOM_UTF16_LE, 'utf-16'), (codecs.BOM_UTF16_BE, 'utf-16')):
+        if head.startswith(bom):
+            return encoding
+    match = META_CHARSET_RE.search(head)
+    return match.group(1).decode('ascii') if match else 'utf-8'
+
+def _decoder(encoding):
+    try:
+        return codecs.getincrementaldecoder(encoding)('replace')
+    except LookupError:
+        return codecs.getincrementaldecoder('utf-8')('replace')
+
+def iter_text(source, encoding=None):
+    if isinstance(source, str):
+        yield source
+        return
+    if isinstance(source, bytes):
+        source = [source]
+    elif hasattr(source, 'read'):
+        stream = source
+        source = iter(lambda: stream.read(CHUNK_SIZE), stream.read(0))
+    decoder = None
+    head = b""
+    for chunk in source:
+        if isinstance(chunk, bytes):
+            if decoder is None:
+                if encoding is None and len(head) + len(chunk) < SNIFF_SIZE:
+                    head += chunk
+                    continue
+                chunk = head + chunk
+                head = b""
+                decoder = _decoder(encoding or sniff_charset(chunk[:SNIFF_SIZE]))
+            chunk = decoder.decode(chunk)
+        if chunk:
+            yield chunk
+    if decoder is None and head:
+        decoder = _decoder(sniff_charset(head))
+        head = decoder.decode(head)
+        if head:
+            yield head
+    if decoder is not None:
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+
+def iter_extract(source, wanted=STREAM_KINDS, encoding=None):
+    parser = StreamExtractor(wanted)
+    for chunk in iter_text(source, encoding):
+        parser.feed(chunk)
+        yield from parser.pop_items()
+    parser.close()
+    yield from parser.pop_items()
+
+def extract(source, wanted=STREAM_KINDS, encoding=None):
+    result = {kind: [] for kind in wanted if kind != 'title'}
+    if 'title' in wanted:
+        result['title'] = None
+    for item in iter_extract(source, wanted, encoding):
+        kind = item.pop('type')
+        if kind == 'title':
+            if result['title'] is None:
+                result['title'] = item['text']
+        else:
+            result[kind + 's'].append(item)
+    return result
+
+class IndexBuilder(HTMLParser):
+    def __init__(self, skip=()):
+        super().__init__(convert_charrefs=True)
+        self.index = PageIndex()
+        self.skip = frozenset(skip)
+        self._open = []
+        self._hold_tag = None
+        self._hold_depth = 0
+        self._hold_position = None
+        self._hold_text = []
+
+    def _hold(self, tag, position=None):
+        self._hold_tag = tag
+        self._hold_depth = 1
+        self._hold_position = position
+        self._hold_text = []
+
+    def _release(self):
+        if self._hold_position is not None:
+            self.index.own_text[self._hold_position] = "".join(self._hold_text)
+            self.index.close(self._hold_position)
+        self._hold_tag = None
+        self._hold_position = None
+        self._hold_text = []
+
+    def handle_starttag(self, tag, attrs):
+        if self._hold_tag is not None:
+            if tag == self._hold_tag:
+                self._hold_depth += 1
+            return
+        if tag in self.skip:
+            if tag not in VOID_TAGS:
+                self._hold(tag)
+            return
+        attrs = {name: '' if value is None else value for name, value in attrs}
+        parent = self._open[-1] if self._open else -1
+        position = self.index.open(tag, attrs, parent)
+        if tag in VOID_TAGS:
+            self.index.close(position)
+        elif tag in OWN_TEXT_TAGS:
+            self._hold(tag, position)
+        else:
+            self._open.append(position)
+
+    def handle_startendtag(self, tag, attrs):
+        if self._hold_tag is not None or tag in self.skip:
+            return
+        self.handle_starttag(tag, attrs)
+        if tag in OWN_TEXT_TAGS:
+            self._release()
+        elif tag not in VOID_TAGS:
+            self.index.close(self._open.pop())
+
+    def handle_endtag(self, tag):
+        if self._hold_tag is not None:
+            if tag == self._hold_tag:
+                self._hold_depth -= 1
+                if not self._hold_depth:
+                    self._release()
+            return
+        names = self.index.names
+        for depth in range(len(self._open) - 1, -1, -1):
+            if names[self._open[depth]] == tag:
+                while len(self._open) > depth:
+                    self.index.close(self._open.pop())
+                return
+
+    def handle_data(self, data):
+        if self._hold_tag is not None:
+            if self._hold_position is not None:
+                self._hold_text.append(data)
+            return
+        self.index.add_text(data)
+
+    def close(self):
+        super().close()
+        if self._hold_tag is not None:
+            self._release()
+        while self._open:
+            self.index.close(self._open.pop())
+        return self.index.finish()
+
+def build_index_stream(source, skip=(), encoding=None):
+    builder = IndexBuilder(skip)
+    for chunk in iter_text(source, encoding):
+        builder.feed(chunk)
+    return builder.close()
@@ -17,13 +17,16 @@ def backup_file(file_path):
     except Exception as e:
         return False, f"Ошибка при создании копии: {str(e)}"
 
-def backup_folder(folder_path, backup_base="backups"):
+def backup_folder(folder_path, backup_base="backups", incremental=False):
     if not os.path.exists(folder_path):
         return False, f"Папка {folder_path} не существует!"
     
     if not os.path.isdir(folder_path):
         return False, f"{folder_path} - это не папка!"
     
+    if incremental:
+        return backup_folder_incremental(folder_path, backup_base)
+    
     try:
         os.makedirs(backup_base, exist_ok=True)
         folder_name = os.path.basename(folder_path)
@@ -39,6 +42,22 @@ def backup_folder(folder_path, backup_base="backups"):
     except Exception as e:
         return False, f"Ошибка при создании копии папки: {str(e)}"
 
+def backup_folder_incremental(folder_path, backup_base="backups"):
+    from .incremental import create_snapshot
+    try:
+        os.makedirs(backup_base, exist_ok=True)
+        stats = create_snapshot(folder_path, backup_base)
+        message = (
+            f"Создана инкрементальная копия папки: {stats['path']} "
+            f"(скопировано: {stats['copied']}, {format_size(stats['copied_bytes'])}; "
+            f"без изменений: {stats['linked']}; ссылок: {stats['links']})"
+        )
+        if stats['skipped']:
+            return False, f"{message}. Не удалось скопировать ссылки: {', '.join(stats['skipped'])}"
+        return True, message
+    except Exception as e:
+        return False, f"Ошибка при создании копии папки: {str(e)}"
+
 def backup_by_extension(folder, extension=".txt", backup_folder="auto_backups"):
     if not os.path.exists(folder):
         return False, f"Папка {folder} не существует!"
@@ -68,6 +87,8 @@ def list_backups(backup_folder="backups"):
     
     backups = []
     for item in os.listdir(backup_folder):
+        if item.startswith(".") or item.endswith(".partial"):
+            continue
         item_path = os.path.join(backup_folder, item)
         if os.path.isdir(item_path):
             size = sum(
@@ -98,6 +119,62 @@ def list_backups(backup_folder="backups"):
     
     return backups
 
+def backup_to_store(path, store_path="backup_store"):
+    if not os.path.exists(path):
+        return False, f"{path} не существует!"
+    
+    try:
+        from .store import ChunkStore
+        stats = ChunkStore(store_path).snapshot(path)
+        return True, (
+            f"Создан снимок {stats['name']}: файлов {stats['files']} ({format_size(stats['total_bytes'])}), "
+            f"ссылок {stats['links']}, "
+            f"без изменений {stats['unchanged']}, новых блоков {stats['new_chunks']} "
+            f"({format_size(stats['new_bytes'])}), повторных блоков {stats['reused_chunks']}"
+        )
+    except Exception as e:
+        return False, f"Ошибка при создании снимка: {str(e)}"
+
+def list_store_snapshots(store_path="backup_store"):
+    if not os.path.isdir(store_path):
+        return []
+    from .store import ChunkStore
+    return ChunkStore(store_path).snapshots()
+
+def restore_from_store(name, target, store_path="backup_store"):
+    try:
+        from .store import ChunkStore
+        restored = ChunkStore(store_path).restore(name, target)
+        return True, f"Восстановлено файлов: {restored} в {target}"
+    except FileNotFoundError:
+        return False, f"Снимок {name} не найден в {store_path}!"
+    except Exception as e:
+        return False, f"Ошибка при восстановлении: {str(e)}"
+
+def delete_store_snapshot(name, store_path="backup_store"):
+    try:
+        from .store import ChunkStore
+        ChunkStore(store_path).delete(name)
+        return True, f"Снимок {name} удалён (место освободит сборка мусора)"
+    except FileNotFoundError:
+        return False, f"Снимок {name} не найден в {store_path}!"
+    except Exception as e:
+        return False, f"Ошибка при удалении снимка: {str(e)}"
+
+def collect_store_garbage(store_path="backup_store"):
+    if not os.path.isdir(store_path):
+        return False, f"Хранилище {store_path} не существует!"
+    
+    try:
+        from .store import ChunkStore
+        stats = ChunkStore(store_path).gc()
+        return True, (
+            f"Удалено блоков: {stats['removed_chunks']} ({format_size(stats['freed_bytes'])}), "
+            f"осталось: {stats['kept_chunks']}"
+        )
+    except Exception as e:
+        return False, f"Ошибка при сборке мусора: {str(e)}"
+
 def format_size(size_bytes):
     for unit in ['Б', 'КБ', 'МБ', 'ГБ']:
         if size_bytes < 1024.0:
@@ -115,6 +192,9 @@ def run():
         print("3. Автоматическое копирование по расширению")
         print("4. Показать список резервных копий")
         print("5. Указать папку для резервных копий")
+        print("6. Копия в хранилище с дедупликацией")
+        print("7. Снимки хранилища и восстановление")
+        print("8. Удалить снимок и собрать мусор")
         print("0. Назад")
         
         выбор = input("\nВыберите действие: ").strip()
@@ -136,9 +216,10 @@ def run():
             backup_base = input("Введите папку для сохранения (по умолчанию 'backups'): ").strip()
             if not backup_base:
                 backup_base = "backups"
+            incremental = input("Инкрементальная копия (только изменённые файлы)? (y/n): ").strip().lower() == 'y'
             
             if folder_path:
-                success, message = backup_folder(folder_path, backup_base)
+                success, message = backup_folder(folder_path, backup_base, incremental)
                 if success:
                     print(f"✅ {message}")
                 else:
@@ -195,6 +276,55 @@ def run():
                 print("Путь к папке не может быть пустым!")
             input("\nНажмите Enter для продолжения...")
             
+        elif выбор == "6":
+            path = input("Введите путь к файлу или папке: ").strip()
+            store_path = input("Введите папку хранилища (по умолчанию 'backup_store'): ").strip() or "backup_store"
+            if path:
+                success, message = backup_to_store(path, store_path)
+                if success:
+                    print(f"✅ {message}")
+                else:
+                    print(f"❌ {message}")
+            else:
+                print("Путь не может быть пустым!")
+            input("\nНажмите Enter для продолжения...")
+            
+        elif выбор == "7":
+            store_path = input("Введите папку хранилища (по умолчанию 'backup_store'): ").strip() or "backup_store"
+            snapshots = list_store_snapshots(store_path)
+            if snapshots:
+                print(f"\n=== Снимки в '{store_path}' ===")
+                print(f"{'Имя':<40} {'Файлов':<10} {'Размер':<15} {'Источник'}")
+                print("-" * 90)
+                for snapshot in snapshots:
+                    print(f"{snapshot['name']:<40} {snapshot['files']:<10} {format_size(snapshot['size']):<15} {snapshot['source']}")
+                name = input("\nВведите имя снимка для восстановления (Enter - пропустить): ").strip()
+                if name:
+                    target = input("Введите папку для восстановления: ").strip()
+                    if target:
+                        success, message = restore_from_store(name, target, store_path)
+                        if success:
+                            print(f"✅ {message}")
+                        else:
+                            print(f"❌ {message}")
+                    else:
+                        print("Путь к папке не может быть пустым!")
+            else:
+                print(f"Снимки в хранилище '{store_path}' не найдены")
+            input("\nНажмите Enter для продолжения...")
+            
+        elif выбор == "8":
+            store_path = input("Введите папку хранилища (по умолчанию 'backup_store'): ").strip() or "backup_store"
+            name = input("Введите имя снимка для удаления (Enter - только сборка мусора): ").strip()
+            if name:
+                confirm = input(f"Удалить снимок {name}? (y/n): ").strip().lower()
+                if confirm == 'y':
+                    success, message = delete_store_snapshot(name, store_path)
+                    print(f"✅ {message}" if success else f"❌ {message}")
+            success, message = collect_store_garbage(store_path)
+            print(f"✅ {message}" if success else f"❌ {message}")
+            input("\nНажмите Enter для продолжения...")
+            
         elif выбор == "0":
             break
         else:
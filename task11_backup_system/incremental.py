@@ -0,0 +1,129 @@
+import datetime
+import hashlib
+import json
+import os
+import shutil
+
+MANIFEST_DIR = ".manifests"
+COPY_CHUNK_SIZE = 1024 * 1024
+
+def copy_with_hash(source, destination):
+    digest = hashlib.blake2b(digest_size=32)
+    with open(source, "rb") as src, open(destination, "wb") as dst:
+        for chunk in iter(lambda: src.read(COPY_CHUNK_SIZE), b""):
+            digest.update(chunk)
+            dst.write(chunk)
+    shutil.copystat(source, destination)
+    return digest.hexdigest()
+
+def manifest_path(snapshot_path):
+    base, name = os.path.split(os.path.normpath(snapshot_path))
+    return os.path.join(base, MANIFEST_DIR, f"{name}.json")
+
+def load_manifest(snapshot_path):
+    try:
+        with open(manifest_path(snapshot_path), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _write_manifest(snapshot_path, manifest):
+    path = manifest_path(snapshot_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(temp_path, path)
+
+def _snapshot_order(stamp):
+    suffix = stamp[16:]
+    return stamp[:15], int(suffix) if suffix.isdigit() else 0
+
+def find_previous_snapshot(folder_path, backup_base="backups"):
+    prefix = f"{os.path.basename(os.path.abspath(folder_path))}_backup_"
+    if not os.path.isdir(backup_base):
+        return None, None
+    names = [name for name in os.listdir(backup_base) if name.startswith(prefix) and not name.endswith(".partial")]
+    for name in sorted(names, key=lambda name: _snapshot_order(name[len(prefix):]), reverse=True):
+        path = os.path.join(backup_base, name)
+        manifest = load_manifest(path) if os.path.isdir(path) else None
+        if manifest is not None and manifest.get('source') == os.path.abspath(folder_path):
+            return path, manifest
+    return None, None
+
+def _link_or_copy(previous, destination, source):
+    try:
+        os.link(previous, destination)
+        return True
+    except OSError:
+        shutil.copy2(source, destination)
+        return False
+
+def create_snapshot(folder_path, backup_base="backups"):
+    folder_path = os.path.abspath(folder_path)
+    previous_path, previous = find_previous_snapshot(folder_path, backup_base)
+    previous_files = previous['files'] if previous else {}
+
+    date_str = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    backup_name = f"{os.path.basename(folder_path)}_backup_{date_str}"
+    backup_path = os.path.join(backup_base, backup_name)
+    suffix = 1
+    while os.path.exists(backup_path):
+        backup_path = os.path.join(backup_base, f"{backup_name}_{suffix}")
+        suffix += 1
+    partial_path = backup_path + ".partial"
+    if os.path.exists(partial_path):
+        shutil.rmtree(partial_path)
+
+    stats = {'path': backup_path, 'previous': previous_path, 'copied': 0, 'linked': 0, 'copied_bytes': 0,
+             'total_bytes': 0, 'skipped': []}
+    files = {}
+    links = {}
+    os.makedirs(partial_path)
+    try:
+        for root, dirs, filenames in os.walk(folder_path):
+            dirs.sort()
+            relative_root = os.path.relpath(root, folder_path)
+            target_root = partial_path if relative_root == "." else os.path.join(partial_path, relative_root)
+            os.makedirs(target_root, exist_ok=True)
+            for filename in sorted(dirs + filenames):
+                source = os.path.join(root, filename)
+                relative = filename if relative_root == "." else os.path.join(relative_root, filename)
+                destination = os.path.join(target_root, filename)
+                if os.path.islink(source):
+                    link_target = os.readlink(source)
+                    try:
+                        os.symlink(link_target, destination)
+                    except OSError:
+                        stats['skipped'].append(relative)
+                    else:
+                        links[relative] = link_target
+                    continue
+                if filename in dirs:
+                    continue
+                st = os.stat(source)
+                entry = {'size': st.st_size, 'mtime': st.st_mtime_ns}
+                old = previous_files.get(relative)
+                stats['total_bytes'] += st.st_size
+                if old is not None and old['size'] == st.st_size and old['mtime'] == st.st_mtime_ns:
+                    entry['hash'] = old['hash']
+                    if _link_or_copy(os.path.join(previous_path, relative), destination, source):
+                        stats['linked'] += 1
+                    else:
+                        stats['copied'] += 1
+                        stats['copied_bytes'] += st.st_size
+                    files[relative] = entry
+                    continue
+                entry['hash'] = copy_with_hash(source, destination)
+                stats['copied'] += 1
+                stats['copied_bytes'] += st.st_size
+                files[relative] = entry
+        os.rename(partial_path, backup_path)
+    except BaseException:
+        shutil.rmtree(partial_path, ignore_errors=True)
+        raise
+    _write_manifest(backup_path, {'source': folder_path, 'created': date_str, 'previous': previous_path,
+                                  'files': files, 'links': links})
+    stats['files'] = len(files)
+    stats['links'] = len(links)
+    return stats
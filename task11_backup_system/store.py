@@ -0,0 +1,266 @@
+import datetime
+import hashlib
+import json
+import os
+import re
+import time
+
+STORE_PATH = "backup_store"
+MIN_CHUNK = 16 * 1024
+MAX_CHUNK = 256 * 1024
+CHUNK_MASK = 0xFFFF << 48
+READ_SIZE = 4 * 1024 * 1024
+HASH_MASK = 0xFFFFFFFFFFFFFFFF
+GC_GRACE_SECONDS = 3600
+SNAPSHOT_NAME_RE = re.compile(r"[^/\\]*_(\d{8}_\d{6})(?:_(\d+))?")
+GEAR = [int.from_bytes(hashlib.blake2b(bytes([i]), digest_size=8).digest(), "big") for i in range(256)]
+
+def _cut_point(data, start, end):
+    if end - start <= MIN_CHUNK:
+        return end
+    limit = min(end, start + MAX_CHUNK)
+    position = start + MIN_CHUNK
+    h = 0
+    gear = GEAR
+    for byte in data[position:limit]:
+        h = ((h << 1) + gear[byte]) & HASH_MASK
+        position += 1
+        if not h & CHUNK_MASK:
+            return position
+    return limit
+
+def iter_chunks(f):
+    buffer = b""
+    eof = False
+    while True:
+        if not eof and len(buffer) < MAX_CHUNK:
+            data = f.read(READ_SIZE)
+            eof = not data
+            buffer += data
+            continue
+        if not buffer:
+            return
+        start = 0
+        while len(buffer) - start >= MAX_CHUNK or (eof and start < len(buffer)):
+            end = _cut_point(buffer, start, len(buffer))
+            yield buffer[start:end]
+            start = end
+        buffer = buffer[start:]
+
+def _flush_to_disk(paths):
+    if hasattr(os, 'sync'):
+        os.sync()
+        return
+    for path in paths:
+        fd = os.open(path, os.O_RDWR)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+def _snapshot_order(name):
+    match = SNAPSHOT_NAME_RE.fullmatch(name)
+    return match.group(1), int(match.group(2) or 0)
+
+class ChunkStore:
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+        self.chunks_path = os.path.join(path, "chunks")
+        self.snapshots_path = os.path.join(path, "snapshots")
+        os.makedirs(self.chunks_path, exist_ok=True)
+        os.makedirs(self.snapshots_path, exist_ok=True)
+
+    def _chunk_path(self, digest):
+        return os.path.join(self.chunks_path, digest[:2], digest)
+
+    def put_chunk(self, data):
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._chunk_path(digest)
+        try:
+            if os.path.getsize(path) == len(data):
+                os.utime(path)
+                return digest, False
+        except OSError:
+            pass
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+        return digest, True
+
+    def _touch_chunks(self, digests):
+        try:
+            for digest in digests:
+                os.utime(self._chunk_path(digest))
+        except FileNotFoundError:
+            return False
+        return True
+
+    def get_chunk(self, digest):
+        with open(self._chunk_path(digest), "rb") as f:
+            data = f.read()
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"повреждён блок {digest}")
+        return data
+
+    def _snapshot_file(self, name):
+        if not SNAPSHOT_NAME_RE.fullmatch(name):
+            raise ValueError(f"Некорректное имя снимка: {name!r}")
+        return os.path.join(self.snapshots_path, f"{name}.json")
+
+    def load_snapshot(self, name):
+        with open(self._snapshot_file(name), encoding="utf-8") as f:
+            return json.load(f)
+
+    def snapshots(self):
+        result = []
+        for filename in os.listdir(self.snapshots_path):
+            if not filename.endswith(".json"):
+                continue
+            try:
+                manifest = self.load_snapshot(filename[:-5])
+            except (OSError, ValueError):
+                continue
+            result.append({
+                'name': manifest['name'],
+                'source': manifest['source'],
+                'created': manifest['created'],
+                'files': len(manifest['files']),
+                'size': sum(entry['size'] for entry in manifest['files'].values())
+            })
+        result.sort(key=lambda snapshot: _snapshot_order(snapshot['name']))
+        return result
+
+    def _previous_files(self, source):
+        for snapshot in reversed(self.snapshots()):
+            if snapshot['source'] == source:
+                return self.load_snapshot(snapshot['name'])['files']
+        return {}
+
+    def _store_file(self, path, stats, written_paths):
+        chunks = []
+        with open(path, "rb") as f:
+            for data in iter_chunks(f):
+                digest, written = self.put_chunk(data)
+                chunks.append(digest)
+                if written:
+                    written_paths.append(self._chunk_path(digest))
+                    stats['new_chunks'] += 1
+                    stats['new_bytes'] += len(data)
+                else:
+                    stats['reused_chunks'] += 1
+        return chunks
+
+    def snapshot(self, source):
+        source = os.path.abspath(source)
+        previous = self._previous_files(source)
+        date_str = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        name = f"{os.path.basename(source)}_{date_str}"
+        suffix = 1
+        while os.path.exists(self._snapshot_file(name)):
+            name = f"{os.path.basename(source)}_{date_str}_{suffix}"
+            suffix += 1
+        stats = {'name': name, 'files': 0, 'links': 0, 'unchanged': 0, 'new_chunks': 0, 'reused_chunks': 0,
+                 'new_bytes': 0, 'total_bytes': 0}
+        files = {}
+        links = {}
+        dirs = []
+        written_paths = []
+        if os.path.isdir(source):
+            entries = []
+            for root, subdirs, filenames in os.walk(source):
+                subdirs.sort()
+                relative_root = os.path.relpath(root, source)
+                if relative_root != ".":
+                    dirs.append(relative_root)
+                for filename in sorted(subdirs + filenames):
+                    path = os.path.join(root, filename)
+                    relative = filename if relative_root == "." else os.path.join(relative_root, filename)
+                    if os.path.islink(path):
+                        links[relative] = os.readlink(path)
+                    elif filename not in subdirs:
+                        entries.append((relative, path))
+        else:
+            entries = [(os.path.basename(source), source)]
+        stats['links'] = len(links)
+        for relative, path in entries:
+            st = os.stat(path)
+            entry = {'size': st.st_size, 'mtime': st.st_mtime_ns, 'mode': st.st_mode & 0o7777}
+            old = previous.get(relative)
+            if old is not None and old['size'] == st.st_size and old['mtime'] == st.st_mtime_ns \
+                    and self._touch_chunks(old['chunks']):
+                entry['chunks'] = old['chunks']
+                stats['unchanged'] += 1
+            else:
+                entry['chunks'] = self._store_file(path, stats, written_paths)
+            files[relative] = entry
+            stats['files'] += 1
+            stats['total_bytes'] += st.st_size
+        manifest = {
+            'name': name,
+            'source': source,
+            'type': 'folder' if os.path.isdir(source) else 'file',
+            'created': date_str,
+            'dirs': dirs,
+            'files': files,
+            'links': links
+        }
+        temp_path = self._snapshot_file(name) + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        _flush_to_disk(written_paths + [temp_path])
+        os.replace(temp_path, self._snapshot_file(name))
+        return stats
+
+    def restore(self, name, target):
+        manifest = self.load_snapshot(name)
+        if os.path.exists(target) and (not os.path.isdir(target) or os.listdir(target)):
+            raise FileExistsError(f"{target} уже существует и не пуст")
+        os.makedirs(target, exist_ok=True)
+        for relative in manifest['dirs']:
+            os.makedirs(os.path.join(target, relative), exist_ok=True)
+        restored = 0
+        for relative, entry in manifest['files'].items():
+            path = os.path.join(target, relative)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                for digest in entry['chunks']:
+                    f.write(self.get_chunk(digest))
+            os.chmod(path, entry['mode'])
+            os.utime(path, ns=(entry['mtime'], entry['mtime']))
+            restored += 1
+        for relative, link_target in manifest.get('links', {}).items():
+            path = os.path.join(target, relative)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.symlink(link_target, path)
+            restored += 1
+        return restored
+
+    def delete(self, name):
+        os.remove(self._snapshot_file(name))
+
+    def gc(self):
+        referenced = set()
+        for filename in os.listdir(self.snapshots_path):
+            if filename.endswith(".json"):
+                for entry in self.load_snapshot(filename[:-5])['files'].values():
+                    referenced.update(entry['chunks'])
+        removed = 0
+        freed = 0
+        cutoff = time.time() - GC_GRACE_SECONDS
+        for prefix in os.listdir(self.chunks_path):
+            directory = os.path.join(self.chunks_path, prefix)
+            for digest in os.listdir(directory):
+                if digest in referenced:
+                    continue
+                path = os.path.join(directory, digest)
+                st = os.stat(path)
+                if st.st_mtime > cutoff:
+                    continue
+                freed += st.st_size
+                os.remove(path)
+                removed += 1
+            if not os.listdir(directory):
+                os.rmdir(directory)
+        return {'removed_chunks': removed, 'freed_bytes': freed, 'kept_chunks': len(referenced)}
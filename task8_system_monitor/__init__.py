@@ -1,10 +1,80 @@
 import psutil
 import time
 import os
+import sys
+import heapq
 import platform
+import threading
+import queue
+from array import array
+from concurrent.futures import Future, wait
 
-def get_cpu_info():
-    cpu_percent = psutil.cpu_percent(interval=1)
+MIN_CPU_WINDOW = 0.1
+
+class CpuSampler:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._system = {}
+        self._process_times = {}
+
+    def system_percent(self, consumer=None):
+        with self._lock:
+            state = self._system.get(consumer)
+        if state is None:
+            state = (psutil.cpu_times(), time.monotonic(), 0.0)
+            time.sleep(MIN_CPU_WINDOW)
+        elif time.monotonic() - state[1] < MIN_CPU_WINDOW:
+            return state[2]
+        previous, _, percent = state
+        times = psutil.cpu_times()
+        now = time.monotonic()
+        total_delta = _total_time(times) - _total_time(previous)
+        idle_delta = _idle_time(times) - _idle_time(previous)
+        if total_delta > 0:
+            busy = max(0.0, total_delta - idle_delta)
+            percent = round(min(100.0, busy / total_delta * 100), 1)
+        with self._lock:
+            self._system[consumer] = (times, now, percent)
+        return percent
+
+    def process_percent(self, pid, cpu_times, create_time):
+        if cpu_times is None:
+            return 0.0
+        used = cpu_times.user + cpu_times.system
+        now = time.monotonic()
+        with self._lock:
+            previous = self._process_times.get(pid)
+            if previous and previous[0] == create_time:
+                if now - previous[2] < MIN_CPU_WINDOW:
+                    return previous[3]
+                percent = round(max(0.0, used - previous[1]) / (now - previous[2]) * 100, 1)
+            else:
+                percent = 0.0
+                lifetime = time.time() - create_time if create_time else 0
+                if lifetime > 0:
+                    percent = round(used / lifetime * 100, 1)
+            self._process_times[pid] = (create_time, used, now, percent)
+            return percent
+
+    def forget_missing(self, alive_pids):
+        with self._lock:
+            for pid in list(self._process_times):
+                if pid not in alive_pids:
+                    del self._process_times[pid]
+
+def _total_time(times):
+    return sum(times) - getattr(times, 'guest', 0.0) - getattr(times, 'guest_nice', 0.0)
+
+def _idle_time(times):
+    return times.idle + getattr(times, 'iowait', 0.0)
+
+_sampler = CpuSampler()
+
+def get_sampler():
+    return _sampler
+
+def get_cpu_info(consumer=None):
+    cpu_percent = get_sampler().system_percent(consumer)
     cpu_count = psutil.cpu_count()
     cpu_freq = psutil.cpu_freq()
     return {
@@ -23,23 +93,119 @@ def get_memory_info():
         'percent': mem.percent
     }
 
-def get_disk_info():
-    disks = []
-    partitions = psutil.disk_partitions()
-    for partition in partitions:
-        try:
-            usage = psutil.disk_usage(partition.mountpoint)
-            disks.append({
-                'device': partition.device,
-                'mountpoint': partition.mountpoint,
-                'fstype': partition.fstype,
-                'total': usage.total,
-                'used': usage.used,
-                'free': usage.free,
-                'percent': usage.percent
-            })
-        except PermissionError:
+DISK_PROBE_TIMEOUT = 2.0
+DISK_PROBE_WORKERS = 8
+SLOW_DISK_SECONDS = 0.5
+SLOW_DISK_TTL = 60.0
+
+class DiskProber:
+    def __init__(self, workers=DISK_PROBE_WORKERS):
+        self.workers = workers
+        self._queue = queue.Queue()
+        self._threads = []
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._cache = {}
+
+    def _ensure_workers(self):
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._work, name="disk-probe", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _work(self):
+        while True:
+            mountpoint, future = self._queue.get()
+            started = time.monotonic()
+            try:
+                usage = psutil.disk_usage(mountpoint)
+            except Exception as e:
+                with self._lock:
+                    self._pending.pop(mountpoint, None)
+                future.set_exception(e)
+                continue
+            finished = time.monotonic()
+            with self._lock:
+                self._pending.pop(mountpoint, None)
+                self._cache[mountpoint] = (finished, usage, finished - started)
+            future.set_result(usage)
+
+    def submit(self, mountpoint):
+        with self._lock:
+            self._ensure_workers()
+            future = self._pending.get(mountpoint)
+            if future is None:
+                future = Future()
+                self._pending[mountpoint] = future
+                self._queue.put((mountpoint, future))
+            return future
+
+    def is_pending(self, mountpoint):
+        with self._lock:
+            return mountpoint in self._pending
+
+    def cached(self, mountpoint, now=None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            entry = self._cache.get(mountpoint)
+        if entry and entry[2] >= SLOW_DISK_SECONDS and now - entry[0] < SLOW_DISK_TTL:
+            return entry[1]
+        return None
+
+_disk_prober = DiskProber()
+
+def get_disk_prober():
+    return _disk_prober
+
+def _disk_key(partition):
+    return partition.device if partition.device.startswith('/') else partition.mountpoint
+
+def get_disk_info(timeout=DISK_PROBE_TIMEOUT):
+    groups = {}
+    for partition in psutil.disk_partitions():
+        groups.setdefault(_disk_key(partition), []).append(partition)
+
+    prober = get_disk_prober()
+    usages = {}
+    futures = {}
+    fresh = []
+    for key, partitions in groups.items():
+        usage = prober.cached(partitions[0].mountpoint)
+        if usage is not None:
+            usages[key] = usage
             continue
+        stuck = prober.is_pending(partitions[0].mountpoint)
+        futures[key] = prober.submit(partitions[0].mountpoint)
+        if not stuck:
+            fresh.append(futures[key])
+    wait(fresh, timeout=timeout)
+
+    disks = []
+    for key, partitions in groups.items():
+        disk = {
+            'device': partitions[0].device,
+            'mountpoint': partitions[0].mountpoint,
+            'mountpoints': [partition.mountpoint for partition in partitions],
+            'fstype': partitions[0].fstype
+        }
+        usage = usages.get(key)
+        if usage is None:
+            future = futures[key]
+            if not future.done():
+                disk.update({'total': None, 'used': None, 'free': None, 'percent': None, 'timed_out': True})
+                disks.append(disk)
+                continue
+            if future.exception() is not None:
+                continue
+            usage = future.result()
+        disk.update({
+            'total': usage.total,
+            'used': usage.used,
+            'free': usage.free,
+            'percent': usage.percent,
+            'timed_out': False
+        })
+        disks.append(disk)
     return disks
 
 def get_system_info():
@@ -51,51 +217,180 @@ def get_system_info():
         'processor': platform.processor()
     }
 
+PROCESS_ATTRS = ['pid', 'name', 'cpu_times', 'create_time', 'memory_percent', 'status']
+
+SNAPSHOT_MAX_AGE = 1.0
+
+PROCESS_BACKENDS = ('psutil', 'procfs', 'auto')
+
+_process_backend = os.environ.get('MONITOR_PROCESS_BACKEND', 'psutil')
+
+def set_process_backend(name):
+    global _process_backend
+    if name not in PROCESS_BACKENDS:
+        raise ValueError(f"Неизвестный бэкенд процессов: {name}")
+    _process_backend = name
+
+def get_process_backend():
+    if _process_backend == 'psutil':
+        return 'psutil'
+    from . import procfs
+    if procfs.available():
+        return 'procfs'
+    if _process_backend == 'procfs':
+        raise RuntimeError("Бэкенд procfs доступен только в Linux")
+    return 'psutil'
+
+class ProcessSnapshot:
+    def __init__(self, taken_at=None):
+        self.taken_at = time.monotonic() if taken_at is None else taken_at
+        self.pids = array('q')
+        self.names = []
+        self.cpu = array('d')
+        self.memory = array('d')
+        self.statuses = []
+        self._name_index = {}
+
+    def add(self, pid, name, cpu_percent, memory_percent, status):
+        name = sys.intern(name or '')
+        self._name_index.setdefault(name.lower(), []).append(len(self.pids))
+        self.pids.append(pid)
+        self.names.append(name)
+        self.cpu.append(cpu_percent or 0.0)
+        self.memory.append(memory_percent or 0.0)
+        self.statuses.append(sys.intern(status or 'N/A'))
+
+    @classmethod
+    def collect(cls, sampler=None, backend=None):
+        sampler = sampler or get_sampler()
+        snapshot = cls()
+        if (backend or get_process_backend()) == 'procfs':
+            from . import procfs
+            for pid, name, cpu_times, create_time, memory_percent, status in procfs.iter_processes():
+                snapshot.add(pid, name, sampler.process_percent(pid, cpu_times, create_time), memory_percent, status)
+            sampler.forget_missing(set(snapshot.pids))
+            return snapshot
+        for proc in psutil.process_iter(PROCESS_ATTRS):
+            try:
+                info = proc.info
+                snapshot.add(
+                    info['pid'],
+                    info['name'],
+                    sampler.process_percent(info['pid'], info['cpu_times'], info['create_time']),
+                    info['memory_percent'],
+                    info['status']
+                )
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        sampler.forget_missing(set(snapshot.pids))
+        return snapshot
+
+    def __len__(self):
+        return len(self.pids)
+
+    def age(self):
+        return time.monotonic() - self.taken_at
+
+    def row(self, index):
+        return {
+            'pid': self.pids[index],
+            'name': self.names[index],
+            'cpu_percent': self.cpu[index],
+            'memory_percent': self.memory[index],
+            'status': self.statuses[index]
+        }
+
+    def rows(self, indices=None):
+        if indices is None:
+            indices = range(len(self.pids))
+        return [self.row(index) for index in indices]
+
+    def top(self, by='cpu', count=10):
+        if by == 'cpu':
+            column = self.cpu
+        elif by == 'memory':
+            column = self.memory
+        else:
+            return self.rows(range(min(count, len(self.pids))))
+        return self.rows(heapq.nlargest(count, range(len(column)), key=column.__getitem__))
+
+    def lookup(self, name):
+        return self.rows(self._name_index.get(name.lower(), []))
+
+    def find(self, name):
+        needle = name.lower()
+        indices = []
+        for key, positions in self._name_index.items():
+            if needle in key:
+                indices.extend(positions)
+        indices.sort()
+        return self.rows(indices)
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+def get_process_snapshot(max_age=SNAPSHOT_MAX_AGE):
+    global _snapshot
+    with _snapshot_lock:
+        if _snapshot is None or _snapshot.age() > max_age:
+            _snapshot = ProcessSnapshot.collect()
+        return _snapshot
+
 def get_all_processes():
-    processes = []
-    for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent', 'status']):
-        try:
-            processes.append(proc.info)
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            continue
-    return processes
+    return get_process_snapshot().rows()
 
 def get_top_processes(by='cpu', count=10):
-    processes = get_all_processes()
-    if by == 'cpu':
-        processes.sort(key=lambda x: x.get('cpu_percent', 0) or 0, reverse=True)
-    elif by == 'memory':
-        processes.sort(key=lambda x: x.get('memory_percent', 0) or 0, reverse=True)
-    return processes[:count]
+    return get_process_snapshot().top(by, count)
 
 def find_processes_by_name(name):
-    found = []
-    for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent']):
-        try:
-            if name.lower() in proc.info['name'].lower():
-                found.append(proc.info)
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            continue
-    return found
+    return get_process_snapshot().find(name)
+
+def _process_details_procfs(pid):
+    from . import procfs
+    info = procfs.read_process_details(pid)
+    if info is None:
+        return None
+    return {
+        'pid': info['pid'],
+        'name': info['name'],
+        'status': info['status'],
+        'cpu_percent': get_sampler().process_percent(pid, info['cpu_times'], info['create_time']),
+        'memory_percent': info['memory_percent'],
+        'memory_info': info['memory_info'],
+        'create_time': time.ctime(info['create_time']),
+        'num_threads': info['num_threads'],
+        'exe': info['exe'] or 'N/A',
+        'cwd': info['cwd'] or 'N/A'
+    }
 
 def get_process_details(pid):
+    if get_process_backend() == 'procfs':
+        return _process_details_procfs(pid)
     try:
         proc = psutil.Process(pid)
-        return {
-            'pid': proc.pid,
-            'name': proc.name(),
-            'status': proc.status(),
-            'cpu_percent': proc.cpu_percent(interval=0.1),
-            'memory_percent': proc.memory_percent(),
-            'memory_info': proc.memory_info()._asdict(),
-            'create_time': time.ctime(proc.create_time()),
-            'num_threads': proc.num_threads(),
-            'exe': proc.exe() if proc.exe() else 'N/A',
-            'cwd': proc.cwd() if proc.cwd() else 'N/A'
-        }
+        with proc.oneshot():
+            create_time = proc.create_time()
+            return {
+                'pid': proc.pid,
+                'name': proc.name(),
+                'status': proc.status(),
+                'cpu_percent': get_sampler().process_percent(proc.pid, proc.cpu_times(), create_time),
+                'memory_percent': proc.memory_percent(),
+                'memory_info': proc.memory_info()._asdict(),
+                'create_time': time.ctime(create_time),
+                'num_threads': proc.num_threads(),
+                'exe': _optional_attr(proc.exe),
+                'cwd': _optional_attr(proc.cwd)
+            }
     except (psutil.NoSuchProcess, psutil.AccessDenied):
         return None
 
+def _optional_attr(getter):
+    try:
+        return getter() or 'N/A'
+    except psutil.AccessDenied:
+        return 'N/A'
+
 def format_bytes(bytes_value):
     for unit in ['Б', 'КБ', 'МБ', 'ГБ', 'ТБ']:
         if bytes_value < 1024.0:
@@ -106,76 +401,135 @@ def format_bytes(bytes_value):
 def clear_screen():
     os.system('cls' if os.name == 'nt' else 'clear')
 
-def display_system_info():
-    system = get_system_info()
-    print("\n=== Системная информация ===")
-    print(f"ОС: {system['system']} {system['release']}")
-    print(f"Версия: {system['version']}")
-    print(f"Архитектура: {system['machine']}")
-    print(f"Процессор: {system['processor']}")
+def system_info_lines(system):
+    return [
+        "",
+        "=== Системная информация ===",
+        f"ОС: {system['system']} {system['release']}",
+        f"Версия: {system['version']}",
+        f"Архитектура: {system['machine']}",
+        f"Процессор: {system['processor']}"
+    ]
 
-def display_cpu_info():
-    cpu = get_cpu_info()
-    print("\n=== CPU ===")
-    print(f"Загрузка: {cpu['percent']}%")
-    print(f"Ядер: {cpu['count']}")
+def cpu_lines(cpu):
+    lines = ["", "=== CPU ===", f"Загрузка: {cpu['percent']}%", f"Ядер: {cpu['count']}"]
     if cpu['freq_current']:
-        print(f"Частота: {cpu['freq_current']:.2f} МГц")
+        lines.append(f"Частота: {cpu['freq_current']:.2f} МГц")
         if cpu['freq_max']:
-            print(f"Макс. частота: {cpu['freq_max']:.2f} МГц")
+            lines.append(f"Макс. частота: {cpu['freq_max']:.2f} МГц")
+    return lines
 
-def display_memory_info():
-    mem = get_memory_info()
-    print("\n=== Память ===")
-    print(f"Всего: {format_bytes(mem['total'])}")
-    print(f"Использовано: {format_bytes(mem['used'])} ({mem['percent']}%)")
-    print(f"Доступно: {format_bytes(mem['available'])}")
+def memory_lines(mem):
+    return [
+        "",
+        "=== Память ===",
+        f"Всего: {format_bytes(mem['total'])}",
+        f"Использовано: {format_bytes(mem['used'])} ({mem['percent']}%)",
+        f"Доступно: {format_bytes(mem['available'])}"
+    ]
 
-def display_disk_info():
-    disks = get_disk_info()
-    print("\n=== Диски ===")
+def disk_lines(disks):
+    lines = ["", "=== Диски ==="]
     for disk in disks:
-        print(f"{disk['device']} ({disk['mountpoint']})")
-        print(f"  Тип: {disk['fstype']}")
-        print(f"  Всего: {format_bytes(disk['total'])}")
-        print(f"  Использовано: {format_bytes(disk['used'])} ({disk['percent']}%)")
-        print(f"  Свободно: {format_bytes(disk['free'])}")
-        print()
+        if disk.get('timed_out'):
+            lines.extend([
+                f"{disk['device']} ({disk['mountpoint']})",
+                f"  Тип: {disk['fstype']}",
+                "  Нет ответа: превышено время ожидания",
+                ""
+            ])
+            continue
+        lines.extend([
+            f"{disk['device']} ({disk['mountpoint']})",
+            f"  Тип: {disk['fstype']}",
+            f"  Всего: {format_bytes(disk['total'])}",
+            f"  Использовано: {format_bytes(disk['used'])} ({disk['percent']}%)",
+            f"  Свободно: {format_bytes(disk['free'])}",
+            ""
+        ])
+    return lines
 
-def display_processes(processes, limit=None):
-    print(f"\n{'PID':<8} {'Имя':<30} {'CPU %':<10} {'Память %':<12} {'Статус':<10}")
-    print("-" * 80)
+def process_lines(processes, limit=None):
+    lines = ["", f"{'PID':<8} {'Имя':<30} {'CPU %':<10} {'Память %':<12} {'Статус':<10}", "-" * 80]
     for proc in (processes[:limit] if limit else processes):
         pid = proc.get('pid', 'N/A')
         name = proc.get('name', 'N/A')[:28]
         cpu = proc.get('cpu_percent', 0) or 0
         mem = proc.get('memory_percent', 0) or 0
         status = proc.get('status', 'N/A')
-        print(f"{pid:<8} {name:<30} {cpu:<10.2f} {mem:<12.2f} {status:<10}")
+        lines.append(f"{pid:<8} {name:<30} {cpu:<10.2f} {mem:<12.2f} {status:<10}")
+    return lines
+
+def history_lines(collector, seconds=60):
+    lines = ["", f"=== История за {seconds} сек ==="]
+    for name, title in [('cpu', 'CPU'), ('memory', 'Память')]:
+        stats = collector.stats(name, seconds)
+        if not stats:
+            continue
+        line = collector.sparkline(name, seconds)
+        lines.append(f"{title:<8} {line:<40} мин {stats['min']:.1f}  сред {stats['avg']:.1f}  "
+                     f"макс {stats['max']:.1f}  p95 {stats['p95']:.1f}")
+    peaks = collector.top_processes(seconds, 3)
+    if peaks:
+        lines.append("Пики CPU: " + ", ".join(f"{proc['name']} ({proc['pid']}) {proc['cpu_percent']:.1f}%" for proc in peaks))
+    if collector.errors:
+        lines.append(f"Ошибок сбора: {collector.errors} (последняя: {collector.last_error})")
+    return lines
+
+def display_system_info():
+    print("\n".join(system_info_lines(get_system_info())))
+
+def display_cpu_info():
+    print("\n".join(cpu_lines(get_cpu_info())))
+
+def display_memory_info():
+    print("\n".join(memory_lines(get_memory_info())))
+
+def display_disk_info():
+    print("\n".join(disk_lines(get_disk_info())))
+
+def display_processes(processes, limit=None):
+    print("\n".join(process_lines(processes, limit)))
+
+def display_history(collector, seconds=60):
+    print("\n".join(history_lines(collector, seconds)))
+
+REALTIME_INTERVAL = 2.0
 
-def realtime_mode():
+def realtime_mode(interval=REALTIME_INTERVAL):
+    from .dashboard import Dashboard
+    from .history import get_collector, release_collector
     print("\n=== Режим реального времени ===")
     print("Нажмите Ctrl+C для выхода")
+    static = [
+        "=" * 80,
+        "SystemMonitor Pro - Режим реального времени",
+        "=" * 80
+    ] + system_info_lines(get_system_info())
+    footer = ["", f"Обновление каждые {interval:g} сек. Ctrl+C — выход"]
+    dashboard = Dashboard()
+    collector = get_collector(interval=min(interval, 1.0))
     try:
         while True:
-            clear_screen()
-            print("=" * 80)
-            print("SystemMonitor Pro - Режим реального времени")
-            print("=" * 80)
-            
-            display_system_info()
-            display_cpu_info()
-            display_memory_info()
-            display_disk_info()
-            
-            top_cpu = get_top_processes('cpu', 5)
-            print("\n=== Топ-5 процессов по CPU ===")
-            display_processes(top_cpu)
-            
-            print("\nОбновление через 2 секунды...")
-            time.sleep(2)
+            started = time.monotonic()
+            top_cpu = get_process_snapshot(max_age=collector.interval).top('cpu', 5)
+            dashboard.render(
+                static
+                + cpu_lines(get_cpu_info('realtime'))
+                + memory_lines(get_memory_info())
+                + disk_lines(get_disk_info())
+                + history_lines(collector)
+                + ["", "=== Топ-5 процессов по CPU ==="]
+                + process_lines(top_cpu)
+                + footer
+            )
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))
     except KeyboardInterrupt:
-        print("\nВыход из режима реального времени")
+        pass
+    finally:
+        dashboard.close()
+        release_collector(collector)
+    print("\nВыход из режима реального времени")
 
 def detail_mode():
     print("\n=== Режим детальной информации ===")
@@ -227,18 +581,76 @@ def search_mode():
     else:
         print(f"Процессы с именем '{name}' не найдены")
 
+def watch_mode():
+    from .dashboard import Dashboard
+    from .watch import WATCH_INTERVAL, ProcessWatcher, watch_lines
+    print("\n=== Наблюдение за процессами ===")
+    запрос = input("Введите PID через запятую или имя процесса: ").strip()
+    if not запрос:
+        print("Запрос не может быть пустым!")
+        return
+    части = [часть.strip() for часть in запрос.split(',') if часть.strip()]
+    if all(часть.isdigit() for часть in части):
+        pids = [int(часть) for часть in части]
+    else:
+        pids = [proc['pid'] for proc in find_processes_by_name(запрос)]
+    watcher = ProcessWatcher(pids, WATCH_INTERVAL)
+    if not watcher.series:
+        print("Процессы не найдены или нет доступа")
+        return
+    header = ["=" * 100, f"Наблюдение за процессами: {len(watcher.series)}", "=" * 100]
+    footer = ["", f"Замер каждые {WATCH_INTERVAL:g} сек. Ctrl+C — выход"]
+    dashboard = Dashboard()
+    try:
+        while True:
+            started = time.monotonic()
+            watcher.sample()
+            dashboard.render(header + watch_lines(watcher) + footer)
+            time.sleep(max(0.0, WATCH_INTERVAL - (time.monotonic() - started)))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        dashboard.close()
+    suspects = watcher.suspects()
+    if suspects:
+        print("\n⚠ Возможные утечки памяти:")
+        for item in suspects:
+            print(f"{item['pid']} {item['name']}: рост RSS {format_bytes(item['rss_slope'] * 60)}/мин (R² {item['rss_r2']:.2f})")
+    else:
+        print("\nРост памяти не обнаружен")
+
+def exporter_mode():
+    from .exporter import EXPORTER_HOST, EXPORTER_PORT, serve
+    print("\n=== Экспорт метрик ===")
+    порт = input(f"Порт (по умолчанию {EXPORTER_PORT}): ").strip()
+    try:
+        port = int(порт) if порт else EXPORTER_PORT
+    except ValueError:
+        print("Введите корректный номер порта!")
+        return
+    print(f"Метрики доступны по адресу http://{EXPORTER_HOST}:{port}/metrics")
+    print("Нажмите Ctrl+C для остановки")
+    try:
+        serve(EXPORTER_HOST, port)
+    except OSError as e:
+        print(f"Ошибка запуска сервера: {str(e)}")
+    except KeyboardInterrupt:
+        print("\nЭкспорт метрик остановлен")
+
 def run():
     print("\n=== SystemMonitor Pro ===")
     
     while True:
         print("\nВыберите режим работы:")
         print("1. Мониторинг системы (CPU, память, диски)")
-        print("2. Режим реального времени (обновление каждые 2 сек)")
+        print("2. Режим реального времени")
         print("3. Топ процессов по CPU")
         print("4. Топ процессов по памяти")
         print("5. Детальная информация о процессе")
         print("6. Поиск процессов по имени")
         print("7. Все процессы")
+        print("8. Экспорт метрик (OpenMetrics по HTTP)")
+        print("9. Наблюдение за процессами (поиск утечек памяти)")
         print("0. Назад")
         
         выбор = input("\nВыберите действие: ").strip()
@@ -252,7 +664,15 @@ def run():
             input("\nНажмите Enter для продолжения...")
             
         elif выбор == "2":
-            realtime_mode()
+            интервал = input(f"Интервал обновления в секундах (по умолчанию {REALTIME_INTERVAL:g}): ").strip()
+            try:
+                interval = float(интервал) if интервал else REALTIME_INTERVAL
+                if interval > 0:
+                    realtime_mode(interval)
+                else:
+                    print("Интервал должен быть положительным числом!")
+            except ValueError:
+                print("Введите корректное число!")
             
         elif выбор == "3":
             print("\n=== Топ-10 процессов по CPU ===")
@@ -281,6 +701,13 @@ def run():
             display_processes(processes, limit=50)
             input("\nНажмите Enter для продолжения...")
             
+        elif выбор == "8":
+            exporter_mode()
+            
+        elif выбор == "9":
+            watch_mode()
+            input("\nНажмите Enter для продолжения...")
+            
         elif выбор == "0":
             break
         else:
@@ -0,0 +1,64 @@
+import os
+import shutil
+import sys
+
+CSI = "\x1b["
+HIDE_CURSOR = CSI + "?25l"
+SHOW_CURSOR = CSI + "?25h"
+CLEAR_SCREEN = CSI + "2J" + CSI + "H"
+CLEAR_LINE = CSI + "K"
+
+STD_OUTPUT_HANDLE = -11
+ENABLE_VIRTUAL_TERMINAL_PROCESSING = 0x0004
+
+def _enable_ansi():
+    if os.name != 'nt':
+        return
+    import ctypes
+    kernel32 = ctypes.windll.kernel32
+    handle = kernel32.GetStdHandle(STD_OUTPUT_HANDLE)
+    mode = ctypes.c_uint32()
+    if kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+        kernel32.SetConsoleMode(handle, mode.value | ENABLE_VIRTUAL_TERMINAL_PROCESSING)
+
+class Dashboard:
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self.interactive = hasattr(self.stream, 'isatty') and self.stream.isatty()
+        self._lines = None
+        self._size = None
+        if self.interactive:
+            _enable_ansi()
+
+    def _fit(self, lines):
+        columns, rows = shutil.get_terminal_size()
+        return [line[:columns] for line in lines[:max(1, rows - 1)]], (columns, rows)
+
+    def render(self, lines):
+        if not self.interactive:
+            self.stream.write("\n".join(lines) + "\n")
+            self.stream.flush()
+            return
+        lines, size = self._fit(lines)
+        out = []
+        if self._lines is None or size != self._size:
+            out.append(HIDE_CURSOR + CLEAR_SCREEN)
+            out.append("\n".join(line + CLEAR_LINE for line in lines))
+        else:
+            previous = self._lines
+            for row, line in enumerate(lines):
+                if row >= len(previous) or previous[row] != line:
+                    out.append(f"{CSI}{row + 1};1H{line}{CLEAR_LINE}")
+            for row in range(len(lines), len(previous)):
+                out.append(f"{CSI}{row + 1};1H{CLEAR_LINE}")
+            out.append(f"{CSI}{len(lines)};1H")
+        self._lines = lines
+        self._size = size
+        self.stream.write("".join(out))
+        self.stream.flush()
+
+    def close(self):
+        if self.interactive and self._lines is not None:
+            self.stream.write(f"{CSI}{len(self._lines) + 1};1H" + SHOW_CURSOR)
+            self.stream.flush()
+        self._lines = None
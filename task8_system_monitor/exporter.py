@@ -0,0 +1,149 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from . import get_cpu_info, get_memory_info, get_disk_info, get_process_snapshot
+
+EXPORTER_HOST = "127.0.0.1"
+EXPORTER_PORT = 9110
+EXPORTER_INTERVAL = 5.0
+EXPORTER_TOP_COUNT = 10
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{escape_label(value)}"' for key, value in labels.items()) + "}"
+
+class MetricsWriter:
+    def __init__(self):
+        self.lines = []
+
+    def family(self, name, help_text, samples, metric_type="gauge", unit=None):
+        self.lines.append(f"# TYPE {name} {metric_type}")
+        if unit:
+            self.lines.append(f"# UNIT {name} {unit}")
+        self.lines.append(f"# HELP {name} {help_text}")
+        for labels, value in samples:
+            if value is not None:
+                self.lines.append(f"{name}{format_labels(labels)} {value}")
+
+    def render(self):
+        return ("\n".join(self.lines) + "\n# EOF\n").encode("utf-8")
+
+def collect_metrics(top_count=EXPORTER_TOP_COUNT):
+    started = time.monotonic()
+    cpu = get_cpu_info('exporter')
+    memory = get_memory_info()
+    disks = get_disk_info()
+    snapshot = get_process_snapshot(max_age=0)
+
+    writer = MetricsWriter()
+    writer.family("system_cpu_usage_percent", "CPU utilisation since the previous refresh.",
+                  [({}, cpu['percent'])])
+    writer.family("system_cpu_count", "Number of logical CPUs.", [({}, cpu['count'])])
+    writer.family("system_cpu_frequency_mhz", "Current CPU frequency.", [({}, cpu['freq_current'])])
+    for field in ('total', 'available', 'used'):
+        writer.family(f"system_memory_{field}_bytes", f"Memory {field}.", [({}, memory[field])], unit="bytes")
+    writer.family("system_memory_usage_percent", "Memory utilisation.", [({}, memory['percent'])])
+    for field in ('total', 'used', 'free'):
+        writer.family(f"system_disk_{field}_bytes", f"Disk space {field}.",
+                      [(_disk_labels(disk), disk[field]) for disk in disks], unit="bytes")
+    writer.family("system_disk_usage_percent", "Disk space utilisation.",
+                  [(_disk_labels(disk), disk['percent']) for disk in disks])
+    writer.family("system_disk_probe_timed_out", "1 if the last disk usage probe timed out.",
+                  [(_disk_labels(disk), int(disk['timed_out'])) for disk in disks])
+
+    statuses = {}
+    for status in snapshot.statuses:
+        statuses[status] = statuses.get(status, 0) + 1
+    writer.family("system_processes", "Processes by status.",
+                  [({'status': status}, count) for status, count in sorted(statuses.items())])
+    writer.family("process_cpu_usage_percent", f"CPU usage of the top {top_count} processes by CPU.",
+                  [(_process_labels(proc), proc['cpu_percent']) for proc in snapshot.top('cpu', top_count)])
+    writer.family("process_memory_usage_percent", f"Memory usage of the top {top_count} processes by memory.",
+                  [(_process_labels(proc), proc['memory_percent']) for proc in snapshot.top('memory', top_count)])
+
+    writer.family("monitor_refresh_timestamp_seconds", "Time of the last metrics refresh.",
+                  [({}, round(time.time(), 3))])
+    writer.family("monitor_refresh_duration_seconds", "Time spent collecting the last refresh.",
+                  [({}, round(time.monotonic() - started, 6))])
+    return writer.render()
+
+def _disk_labels(disk):
+    return {'device': disk['device'], 'mountpoint': disk['mountpoint'], 'fstype': disk['fstype']}
+
+def _process_labels(proc):
+    return {'pid': proc['pid'], 'name': proc['name']}
+
+class MetricsCache:
+    def __init__(self, interval=EXPORTER_INTERVAL, top_count=EXPORTER_TOP_COUNT):
+        self.interval = interval
+        self.top_count = top_count
+        self._payload = b"# EOF\n"
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.errors = 0
+
+    def refresh(self):
+        payload = collect_metrics(self.top_count)
+        with self._lock:
+            self._payload = payload
+
+    def payload(self):
+        with self._lock:
+            return self._payload
+
+    def start(self):
+        self.refresh()
+        self._thread = threading.Thread(target=self._loop, name="metrics-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception:
+                self.errors += 1
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    cache = None
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.cache.payload()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def create_exporter(host=EXPORTER_HOST, port=EXPORTER_PORT, interval=EXPORTER_INTERVAL):
+    cache = MetricsCache(interval)
+    handler = type("BoundMetricsHandler", (MetricsHandler,), {'cache': cache})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server, cache
+
+def serve(host=EXPORTER_HOST, port=EXPORTER_PORT, interval=EXPORTER_INTERVAL):
+    server, cache = create_exporter(host, port, interval)
+    cache.start()
+    try:
+        server.serve_forever()
+    finally:
+        cache.stop()
+        server.server_close()
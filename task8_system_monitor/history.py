@@ -0,0 +1,197 @@
+import threading
+import time
+from array import array
+from collections import deque
+
+import psutil
+
+from . import get_sampler, get_disk_info, get_process_snapshot
+
+HISTORY_INTERVAL = 1.0
+HISTORY_SECONDS = 600
+HISTORY_TOP_COUNT = 5
+DISK_EVERY = 5
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+class RingBuffer:
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._times = array('d', [0.0]) * capacity
+        self._values = array('d', [0.0]) * capacity
+        self._next = 0
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._size
+
+    def append(self, timestamp, value):
+        with self._lock:
+            self._times[self._next] = timestamp
+            self._values[self._next] = value
+            self._next = (self._next + 1) % self.capacity
+            if self._size < self.capacity:
+                self._size += 1
+
+    def window(self, seconds=None, now=None):
+        with self._lock:
+            cutoff = None
+            if seconds is not None:
+                cutoff = (time.monotonic() if now is None else now) - seconds
+            values = []
+            index = self._next
+            for _ in range(self._size):
+                index = (index - 1) % self.capacity
+                if cutoff is not None and self._times[index] < cutoff:
+                    break
+                values.append(self._values[index])
+            values.reverse()
+            return values
+
+    def latest(self):
+        with self._lock:
+            if not self._size:
+                return None
+            return self._values[(self._next - 1) % self.capacity]
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * q / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    fraction = position - lower
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction
+
+def summarize(values):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return {
+        'count': len(ordered),
+        'min': ordered[0],
+        'max': ordered[-1],
+        'avg': sum(ordered) / len(ordered),
+        'p50': percentile(ordered, 50),
+        'p90': percentile(ordered, 90),
+        'p95': percentile(ordered, 95),
+        'p99': percentile(ordered, 99)
+    }
+
+def sparkline(values, width=40, scale=100.0):
+    if not values:
+        return ""
+    if len(values) > width:
+        step = len(values) / width
+        values = [max(values[int(i * step):int((i + 1) * step)] or [0.0]) for i in range(width)]
+    top = scale or max(values) or 1.0
+    last = len(SPARK_CHARS) - 1
+    return "".join(SPARK_CHARS[max(0, min(last, int(value / top * last + 0.5)))] for value in values)
+
+class HistoryCollector:
+    def __init__(self, interval=HISTORY_INTERVAL, seconds=HISTORY_SECONDS,
+                 top_count=HISTORY_TOP_COUNT, disk_every=DISK_EVERY):
+        self.interval = interval
+        self.capacity = max(1, int(seconds / interval))
+        self.top_count = top_count
+        self.disk_every = disk_every
+        self.series = {
+            'cpu': RingBuffer(self.capacity),
+            'memory': RingBuffer(self.capacity)
+        }
+        self.top = deque(maxlen=self.capacity)
+        self._ticks = 0
+        self.errors = 0
+        self.last_error = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.is_running():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="history-collector", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _loop(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self.sample()
+            except Exception as e:
+                self.errors += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+            self._stop.wait(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def sample(self):
+        now = time.monotonic()
+        self.series['cpu'].append(now, get_sampler().system_percent('history'))
+        self.series['memory'].append(now, psutil.virtual_memory().percent)
+        if self._ticks % self.disk_every == 0:
+            for disk in get_disk_info():
+                if disk['percent'] is None:
+                    continue
+                key = f"disk:{disk['mountpoint']}"
+                if key not in self.series:
+                    self.series[key] = RingBuffer(self.capacity)
+                self.series[key].append(now, disk['percent'])
+        top = get_process_snapshot(max_age=self.interval / 2).top('cpu', self.top_count)
+        self.top.append((now, tuple((proc['pid'], proc['name'], proc['cpu_percent']) for proc in top)))
+        self._ticks += 1
+
+    def values(self, name, seconds=None):
+        buffer = self.series.get(name)
+        return buffer.window(seconds) if buffer else []
+
+    def stats(self, name, seconds=None):
+        return summarize(self.values(name, seconds))
+
+    def sparkline(self, name, seconds=60, width=40):
+        return sparkline(self.values(name, seconds), width)
+
+    def top_processes(self, seconds=60, count=HISTORY_TOP_COUNT):
+        cutoff = time.monotonic() - seconds
+        peaks = {}
+        for timestamp, entries in list(self.top):
+            if timestamp < cutoff:
+                continue
+            for pid, name, cpu in entries:
+                if cpu > peaks.get((pid, name), -1.0):
+                    peaks[(pid, name)] = cpu
+        ranked = sorted(peaks.items(), key=lambda item: item[1], reverse=True)[:count]
+        return [{'pid': pid, 'name': name, 'cpu_percent': cpu} for (pid, name), cpu in ranked]
+
+_collector = None
+_collector_users = 0
+_collector_lock = threading.Lock()
+
+def get_collector(interval=HISTORY_INTERVAL, seconds=HISTORY_SECONDS):
+    global _collector, _collector_users
+    with _collector_lock:
+        if _collector is not None and (_collector.interval, _collector.capacity) != (interval, max(1, int(seconds / interval))):
+            if _collector_users:
+                raise ValueError(f"Сборщик истории уже запущен с интервалом {_collector.interval:g} сек")
+            _collector = None
+        if _collector is None:
+            _collector = HistoryCollector(interval, seconds)
+        _collector.start()
+        _collector_users += 1
+        return _collector
+
+def release_collector(collector):
+    global _collector_users
+    with _collector_lock:
+        if collector is not _collector or not _collector_users:
+            return
+        _collector_users -= 1
+        if not _collector_users:
+            collector.stop()
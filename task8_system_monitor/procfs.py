@@ -0,0 +1,151 @@
+import os
+import sys
+import time
+from collections import namedtuple
+
+PROC_ROOT = "/proc"
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+COMM_LENGTH = 15
+
+STATUSES = {
+    "R": "running",
+    "S": "sleeping",
+    "D": "disk-sleep",
+    "T": "stopped",
+    "t": "tracing-stop",
+    "Z": "zombie",
+    "X": "dead",
+    "x": "dead",
+    "K": "wake-kill",
+    "W": "waking",
+    "P": "parked",
+    "I": "idle",
+}
+
+CpuTimes = namedtuple("CpuTimes", ["user", "system"])
+
+def available(root=PROC_ROOT):
+    return sys.platform.startswith("linux") and os.path.isfile(os.path.join(root, "stat"))
+
+def _read(path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.read(fd, 4096)
+    finally:
+        os.close(fd)
+
+def _read_all(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+def boot_time(root=PROC_ROOT):
+    for line in _read_all(os.path.join(root, "stat")).splitlines():
+        if line.startswith(b"btime"):
+            return float(line.split()[1])
+    return time.time() - time.monotonic()
+
+def total_memory(root=PROC_ROOT):
+    for line in _read_all(os.path.join(root, "meminfo")).splitlines():
+        if line.startswith(b"MemTotal:"):
+            return int(line.split()[1]) * 1024
+    return 0
+
+def full_name(base, name):
+    if len(name) < COMM_LENGTH:
+        return name
+    try:
+        cmdline = _read(base + "/cmdline")
+    except OSError:
+        return name
+    program = os.path.basename(cmdline.split(b"\0", 1)[0].decode("utf-8", "replace"))
+    return program if program.startswith(name) else name
+
+def parse_stat(data):
+    left = data.find(b"(")
+    right = data.rfind(b")")
+    fields = data[right + 2:].split()
+    return {
+        "name": data[left + 1:right].decode("utf-8", "replace"),
+        "status": STATUSES.get(fields[0].decode(), "?"),
+        "ppid": int(fields[1]),
+        "utime": int(fields[11]) / CLOCK_TICKS,
+        "stime": int(fields[12]) / CLOCK_TICKS,
+        "num_threads": int(fields[17]),
+        "starttime": int(fields[19]) / CLOCK_TICKS,
+    }
+
+def parse_statm(data):
+    size, resident, shared, text, lib, data_pages, dirty = (int(value) * PAGE_SIZE for value in data.split()[:7])
+    return {
+        "rss": resident,
+        "vms": size,
+        "shared": shared,
+        "text": text,
+        "lib": lib,
+        "data": data_pages,
+        "dirty": dirty,
+    }
+
+def iter_processes(root=PROC_ROOT):
+    btime = boot_time(root)
+    memory_total = total_memory(root) or 1
+    for entry in os.scandir(root):
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = _read(entry.path + "/stat")
+            statm = _read(entry.path + "/statm")
+        except OSError:
+            continue
+        right = stat.rfind(b")")
+        fields = stat[right + 2:].split()
+        resident = int(statm.split(None, 2)[1]) * PAGE_SIZE
+        yield (
+            int(entry.name),
+            full_name(entry.path, stat[stat.find(b"(") + 1:right].decode("utf-8", "replace")),
+            CpuTimes(int(fields[11]) / CLOCK_TICKS, int(fields[12]) / CLOCK_TICKS),
+            btime + int(fields[19]) / CLOCK_TICKS,
+            resident * 100.0 / memory_total,
+            STATUSES.get(fields[0].decode(), "?"),
+        )
+
+def _readlink(path):
+    try:
+        return os.readlink(path)
+    except OSError:
+        return None
+
+def read_process_details(pid, root=PROC_ROOT):
+    base = os.path.join(root, str(pid))
+    try:
+        stat = parse_stat(_read(base + "/stat"))
+        memory_info = parse_statm(_read(base + "/statm"))
+    except (OSError, ValueError, IndexError):
+        return None
+    return {
+        "pid": pid,
+        "name": full_name(base, stat["name"]),
+        "status": stat["status"],
+        "cpu_times": CpuTimes(stat["utime"], stat["stime"]),
+        "create_time": boot_time(root) + stat["starttime"],
+        "memory_percent": memory_info["rss"] * 100.0 / (total_memory(root) or 1),
+        "memory_info": memory_info,
+        "num_threads": stat["num_threads"],
+        "exe": _readlink(base + "/exe"),
+        "cwd": _readlink(base + "/cwd"),
+    }
+
+def read_sample(pid, root=PROC_ROOT):
+    base = f"{root}/{pid}"
+    stat = _read(base + "/stat")
+    statm = _read(base + "/statm")
+    fields = stat[stat.rfind(b")") + 2:].split()
+    size, resident = statm.split(None, 2)[:2]
+    return (
+        int(fields[19]),
+        (int(fields[11]) + int(fields[12])) / CLOCK_TICKS,
+        int(fields[17]),
+        int(size) * PAGE_SIZE,
+        int(resident) * PAGE_SIZE,
+    )
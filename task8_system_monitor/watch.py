@@ -0,0 +1,166 @@
+import time
+
+import psutil
+
+from . import get_process_backend, format_bytes
+
+WATCH_INTERVAL = 0.5
+LEAK_MIN_SAMPLES = 20
+LEAK_MIN_SLOPE = 1024.0
+LEAK_MIN_R2 = 0.8
+
+class Trend:
+    def __init__(self):
+        self.count = 0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self.m2_x = 0.0
+        self.m2_y = 0.0
+        self.c_xy = 0.0
+
+    def add(self, x, y):
+        self.count += 1
+        dx = x - self.mean_x
+        dy = y - self.mean_y
+        self.mean_x += dx / self.count
+        self.mean_y += dy / self.count
+        self.m2_x += dx * (x - self.mean_x)
+        self.m2_y += dy * (y - self.mean_y)
+        self.c_xy += dx * (y - self.mean_y)
+
+    def slope(self):
+        return self.c_xy / self.m2_x if self.m2_x > 0 else 0.0
+
+    def r2(self):
+        if self.m2_x <= 0 or self.m2_y <= 0:
+            return 0.0
+        return self.c_xy * self.c_xy / (self.m2_x * self.m2_y)
+
+class ProcessSeries:
+    def __init__(self, pid, name, identity, started):
+        self.pid = pid
+        self.name = name
+        self.identity = identity
+        self.started = started
+        self.alive = True
+        self.rss = None
+        self.vms = None
+        self.threads = None
+        self.cpu = None
+        self.rss_trend = Trend()
+        self._last_cpu = None
+
+    def add(self, now, cpu_seconds, threads, vms, rss):
+        cpu_percent = 0.0
+        if self._last_cpu is not None and now > self._last_cpu[1]:
+            cpu_percent = max(0.0, cpu_seconds - self._last_cpu[0]) / (now - self._last_cpu[1]) * 100
+        self._last_cpu = (cpu_seconds, now)
+        self.rss = rss
+        self.vms = vms
+        self.threads = threads
+        self.cpu = cpu_percent
+        self.rss_trend.add(now - self.started, rss)
+
+    def is_leaking(self, min_samples=LEAK_MIN_SAMPLES, min_slope=LEAK_MIN_SLOPE, min_r2=LEAK_MIN_R2):
+        trend = self.rss_trend
+        return trend.count >= min_samples and trend.slope() >= min_slope and trend.r2() >= min_r2
+
+    def summary(self):
+        return {
+            'pid': self.pid,
+            'name': self.name,
+            'alive': self.alive,
+            'samples': self.rss_trend.count,
+            'rss': self.rss,
+            'vms': self.vms,
+            'num_threads': self.threads,
+            'cpu_percent': self.cpu,
+            'rss_slope': self.rss_trend.slope(),
+            'rss_r2': self.rss_trend.r2(),
+            'leak_suspected': self.is_leaking()
+        }
+
+class ProcessWatcher:
+    def __init__(self, pids, interval=WATCH_INTERVAL, backend=None):
+        self.interval = interval
+        self.backend = backend or get_process_backend()
+        self.series = {}
+        self._procs = {}
+        for pid in pids:
+            self.add(pid)
+
+    def add(self, pid):
+        started = time.monotonic()
+        try:
+            proc = psutil.Process(pid)
+            name = proc.name()
+            identity = proc.create_time()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return False
+        if self.backend == 'procfs':
+            from . import procfs
+            try:
+                identity = procfs.read_sample(pid)[0]
+            except (OSError, ValueError, IndexError):
+                return False
+        else:
+            self._procs[pid] = proc
+        self.series[pid] = ProcessSeries(pid, name, identity, started)
+        return True
+
+    def _read(self, pid):
+        if self.backend == 'procfs':
+            from . import procfs
+            return procfs.read_sample(pid)
+        proc = self._procs[pid]
+        if not proc.is_running():
+            raise psutil.NoSuchProcess(pid)
+        with proc.oneshot():
+            times = proc.cpu_times()
+            memory = proc.memory_info()
+            return self.series[pid].identity, times.user + times.system, proc.num_threads(), memory.vms, memory.rss
+
+    def sample(self):
+        now = time.monotonic()
+        for pid, series in self.series.items():
+            if not series.alive:
+                continue
+            try:
+                identity, cpu_seconds, threads, vms, rss = self._read(pid)
+            except (OSError, ValueError, IndexError, psutil.NoSuchProcess, psutil.AccessDenied):
+                series.alive = False
+                continue
+            if identity != series.identity:
+                series.alive = False
+                continue
+            series.add(now, cpu_seconds, threads, vms, rss)
+
+    def report(self):
+        return [series.summary() for series in self.series.values()]
+
+    def suspects(self):
+        return [series.summary() for series in self.series.values() if series.is_leaking()]
+
+def watch_lines(watcher):
+    lines = [
+        f"{'PID':<8} {'Имя':<20} {'RSS':<12} {'VMS':<12} {'Потоков':<8} {'CPU %':<8} {'Рост RSS/мин':<14} {'R²':<6} Статус",
+        "-" * 100
+    ]
+    for item in watcher.report():
+        if item['rss'] is None:
+            lines.append(f"{item['pid']:<8} {item['name'][:18]:<20} нет данных")
+            continue
+        if not item['alive']:
+            status = "завершён"
+        elif item['leak_suspected']:
+            status = "⚠ возможна утечка"
+        else:
+            status = "ok"
+        growth = item['rss_slope'] * 60
+        sign = "-" if growth < 0 else "+"
+        lines.append(
+            f"{item['pid']:<8} {item['name'][:18]:<20} {format_bytes(item['rss']):<12} "
+            f"{format_bytes(item['vms']):<12} {int(item['num_threads']):<8} {item['cpu_percent']:<8.1f} "
+            f"{sign + format_bytes(abs(growth)):<14} {item['rss_r2']:<6.2f} {status}"
+        )
+    return lines
@@ -1,41 +1,192 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
 import requests
+from requests.adapters import HTTPAdapter
+
+from .throttle import (
+    MAX_RETRIES, RATE_BURST, RATE_LIMIT, RETRY_STATUSES,
+    Coalescer, RequestStats, TokenBucket, backoff_delay
+)
+
+WTTR_URL = "https://wttr.in"
+REQUEST_TIMEOUT = 10
+MAX_CONCURRENCY = 8
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=MAX_CONCURRENCY)
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+        return _session
+
+def build_url(city, format_type='full'):
+    if format_type == 'short':
+        return f"{WTTR_URL}/{city}?format=3"
+    elif format_type == 'minimal':
+        return f"{WTTR_URL}/{city}?format=1"
+    elif format_type == 'json':
+        return f"{WTTR_URL}/{city}?format=j1&lang=ru"
+    else:
+        return f"{WTTR_URL}/{city}?lang=ru"
+
+_stats = RequestStats()
+_bucket = TokenBucket(RATE_LIMIT, RATE_BURST, _stats)
+_coalescer = Coalescer(_stats)
+
+def configure_rate_limit(rate=RATE_LIMIT, burst=RATE_BURST):
+    global _bucket
+    _bucket = TokenBucket(rate, burst, _stats)
+
+def get_request_stats():
+    return _stats.snapshot()
+
+def _request(url, session, timeout):
+    attempt = 0
+    while True:
+        _bucket.acquire()
+        _stats.add('requests')
+        response = session.get(url, timeout=timeout)
+        if response.status_code not in RETRY_STATUSES or attempt >= MAX_RETRIES:
+            return response
+        _stats.add('retried')
+        time.sleep(backoff_delay(attempt, response.headers.get('Retry-After')))
+        attempt += 1
 
-def get_weather(city, format_type='full'):
+def fetch_weather(city, format_type='full', session=None, timeout=REQUEST_TIMEOUT):
+    from .cache import normalize_city
+    url = build_url(city, format_type)
     try:
-        if format_type == 'short':
-            url = f"https://wttr.in/{city}?format=3"
-        elif format_type == 'minimal':
-            url = f"https://wttr.in/{city}?format=1"
-        else:
-            url = f"https://wttr.in/{city}?lang=ru"
-        
-        response = requests.get(url, timeout=10)
+        response = _coalescer.run(
+            (normalize_city(city), format_type),
+            lambda: _request(url, session or get_session(), timeout)
+        )
         
         if response.status_code == 200:
-            return response.text
+            return response.text, None
         else:
-            return None
+            return None, f"Ошибка: статус код {response.status_code}"
             
     except requests.exceptions.Timeout:
-        return "Ошибка: Превышено время ожидания. Проверьте интернет-соединение."
+        return None, "Ошибка: Превышено время ожидания. Проверьте интернет-соединение."
     except requests.exceptions.ConnectionError:
-        return "Ошибка: Нет подключения к интернету."
+        return None, "Ошибка: Нет подключения к интернету."
     except requests.exceptions.RequestException as e:
-        return f"Ошибка при запросе: {str(e)}"
+        return None, f"Ошибка при запросе: {str(e)}"
     except Exception as e:
-        return f"Неожиданная ошибка: {str(e)}"
+        return None, f"Неожиданная ошибка: {str(e)}"
+
+_cache = None
+
+def configure_cache(ttl=None, stale_ttl=None, max_entries=None, path=None):
+    global _cache
+    from .cache import CACHE_MAX_ENTRIES, CACHE_STALE_TTL, CACHE_TTL, WeatherCache
+    if _cache is not None:
+        _cache.close()
+    _cache = WeatherCache(
+        CACHE_TTL if ttl is None else ttl,
+        CACHE_STALE_TTL if stale_ttl is None else stale_ttl,
+        CACHE_MAX_ENTRIES if max_entries is None else max_entries,
+        path
+    )
+    return _cache
+
+def disable_cache():
+    global _cache
+    if _cache is not None:
+        _cache.close()
+    _cache = None
+
+def get_cache():
+    return _cache
+
+def get_weather(city, format_type='full', session=None, timeout=REQUEST_TIMEOUT):
+    def fetch():
+        return fetch_weather(city, format_type, session, timeout)
+    
+    cache = get_cache()
+    if cache is not None:
+        weather, ошибка = cache.get(city, format_type, fetch)
+    else:
+        weather, ошибка = fetch()
+    return weather, ошибка
+
+def fetch_weather_report(city, session=None, timeout=REQUEST_TIMEOUT):
+    from .report import parse_weather_json, report_to_json
+    text, ошибка = fetch_weather(city, 'json', session, timeout)
+    if text is None:
+        return None, ошибка
+    try:
+        return report_to_json(parse_weather_json(json.loads(text), city)), None
+    except (ValueError, AttributeError, IndexError) as e:
+        return None, f"Ошибка разбора ответа: {str(e)}"
+
+def get_weather_report(city, session=None, timeout=REQUEST_TIMEOUT):
+    from .report import report_from_json
+    
+    def fetch():
+        return fetch_weather_report(city, session, timeout)
+    
+    cache = get_cache()
+    if cache is not None:
+        compact, ошибка = cache.get(city, 'json', fetch)
+    else:
+        compact, ошибка = fetch()
+    if compact is None:
+        return None, ошибка
+    return report_from_json(compact), None
+
+def _run_concurrent(func, cities, max_workers, deadline, timed_out):
+    if not cities:
+        return []
+    session = get_session()
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(cities))))
+    try:
+        futures = [executor.submit(func, city, session) for city in cities]
+        wait(futures, timeout=deadline)
+        results = []
+        for future in futures:
+            if future.done():
+                results.append(future.result())
+            else:
+                future.cancel()
+                results.append(timed_out)
+        return results
+    finally:
+        executor.shutdown(wait=False)
+
+DEADLINE_ERROR = "Ошибка: Превышено общее время ожидания."
+
+def get_weather_concurrent(cities, format_type='short', max_workers=MAX_CONCURRENCY, deadline=None):
+    def fetch(city, session):
+        return get_weather(city, format_type, session)
+    
+    return _run_concurrent(fetch, cities, max_workers, deadline, (None, DEADLINE_ERROR))
 
-def get_weather_multiple_cities(cities):
+def get_weather_reports(cities, max_workers=MAX_CONCURRENCY, deadline=None):
+    return _run_concurrent(get_weather_report, cities, max_workers, deadline, (None, DEADLINE_ERROR))
+
+def get_weather_multiple_cities(cities, max_workers=MAX_CONCURRENCY, deadline=None):
     results = []
-    for city in cities:
-        weather = get_weather(city, 'short')
+    for city, (weather, ошибка) in zip(cities, get_weather_concurrent(cities, 'short', max_workers, deadline)):
         if weather:
             results.append(f"{city}: {weather}")
         else:
-            results.append(f"{city}: Не удалось получить данные")
+            results.append(f"{city}: Не удалось получить данные ({ошибка})")
     return results
 
 def run():
+    if get_cache() is None:
+        configure_cache(path=os.environ.get("WEATHER_CACHE_PATH"))
     print("\n=== Парсер погоды ===")
     
     while True:
@@ -45,6 +196,7 @@ def run():
         print("3. Погода для одного города (минимальный формат)")
         print("4. Погода для нескольких городов")
         print("5. Погода для города (с выбором формата)")
+        print("6. Структурированный прогноз (температура, ветер, влажность, по часам)")
         print("0. Назад")
         
         выбор = input("\nВыберите действие: ").strip()
@@ -53,12 +205,12 @@ def run():
             город = input("Введите название города: ").strip()
             if город:
                 print("\nЗагрузка данных...")
-                погода = get_weather(город, 'full')
+                погода, ошибка = get_weather(город, 'full')
                 if погода:
                     print(f"\n=== Погода в {город} ===")
                     print(погода)
                 else:
-                    print(f"Не удалось получить данные о погоде для города {город}")
+                    print(f"Не удалось получить данные о погоде для города {город}: {ошибка}")
             else:
                 print("Название города не может быть пустым!")
             input("\nНажмите Enter для продолжения...")
@@ -67,12 +219,12 @@ def run():
             город = input("Введите название города: ").strip()
             if город:
                 print("\nЗагрузка данных...")
-                погода = get_weather(город, 'short')
+                погода, ошибка = get_weather(город, 'short')
                 if погода:
                     print(f"\n=== Погода в {город} ===")
                     print(погода)
                 else:
-                    print(f"Не удалось получить данные о погоде для города {город}")
+                    print(f"Не удалось получить данные о погоде для города {город}: {ошибка}")
             else:
                 print("Название города не может быть пустым!")
             input("\nНажмите Enter для продолжения...")
@@ -81,12 +233,12 @@ def run():
             город = input("Введите название города: ").strip()
             if город:
                 print("\nЗагрузка данных...")
-                погода = get_weather(город, 'minimal')
+                погода, ошибка = get_weather(город, 'minimal')
                 if погода:
                     print(f"\n=== Погода в {город} ===")
                     print(погода)
                 else:
-                    print(f"Не удалось получить данные о погоде для города {город}")
+                    print(f"Не удалось получить данные о погоде для города {город}: {ошибка}")
             else:
                 print("Название города не может быть пустым!")
             input("\nНажмите Enter для продолжения...")
@@ -123,12 +275,27 @@ def run():
                     формат_тип = 'minimal'
                 
                 print("\nЗагрузка данных...")
-                погода = get_weather(город, формат_тип)
+                погода, ошибка = get_weather(город, формат_тип)
                 if погода:
                     print(f"\n=== Погода в {город} ===")
                     print(погода)
                 else:
-                    print(f"Не удалось получить данные о погоде для города {город}")
+                    print(f"Не удалось получить данные о погоде для города {город}: {ошибка}")
+            else:
+                print("Название города не может быть пустым!")
+            input("\nНажмите Enter для продолжения...")
+            
+        elif выбор == "6":
+            город = input("Введите название города: ").strip()
+            if город:
+                from .report import report_lines
+                print("\nЗагрузка данных...")
+                отчёт, ошибка = get_weather_report(город)
+                if отчёт:
+                    print(f"\n=== Погода в {город} ===")
+                    print("\n".join(report_lines(отчёт)))
+                else:
+                    print(ошибка)
             else:
                 print("Название города не может быть пустым!")
             input("\nНажмите Enter для продолжения...")
@@ -0,0 +1,139 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+CACHE_TTL = 300.0
+CACHE_STALE_TTL = 3600.0
+CACHE_MAX_ENTRIES = 512
+
+def normalize_city(city):
+    return " ".join(city.split()).casefold()
+
+class WeatherCache:
+    def __init__(self, ttl=CACHE_TTL, stale_ttl=CACHE_STALE_TTL, max_entries=CACHE_MAX_ENTRIES, path=None):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.path = path
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._threads = []
+        self._db = None
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        if path:
+            self._open_store(path)
+
+    def _open_store(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS weather ("
+            "city TEXT NOT NULL, format TEXT NOT NULL, value TEXT NOT NULL, fetched_at REAL NOT NULL, "
+            "PRIMARY KEY (city, format))"
+        )
+        self._db.execute("DELETE FROM weather WHERE fetched_at < ?", (time.time() - self.ttl - self.stale_ttl,))
+        self._db.commit()
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return entry
+        if self._db is None:
+            return None
+        row = self._db.execute(
+            "SELECT value, fetched_at FROM weather WHERE city = ? AND format = ?", key
+        ).fetchone()
+        if row is None:
+            return None
+        self._remember(key, row[0], row[1])
+        return row
+
+    def _remember(self, key, value, fetched_at):
+        self._entries[key] = (value, fetched_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def put(self, city, format_type, value, fetched_at=None):
+        key = (normalize_city(city), format_type)
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        with self._lock:
+            self._remember(key, value, fetched_at)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO weather (city, format, value, fetched_at) VALUES (?, ?, ?, ?)",
+                    (key[0], key[1], value, fetched_at)
+                )
+                self._db.commit()
+
+    def get(self, city, format_type, fetch):
+        key = (normalize_city(city), format_type)
+        now = time.time()
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                age = now - entry[1]
+                if age < self.ttl:
+                    self.hits += 1
+                    return entry[0], None
+                if age < self.ttl + self.stale_ttl:
+                    self.stale_hits += 1
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        thread = threading.Thread(target=self._revalidate, args=(key, city, format_type, fetch),
+                                                  daemon=True)
+                        self._threads = [item for item in self._threads if item.is_alive()] + [thread]
+                        thread.start()
+                    return entry[0], None
+            self.misses += 1
+        return self._fetch_and_store(city, format_type, fetch)
+
+    def _fetch_and_store(self, city, format_type, fetch):
+        weather, ошибка = fetch()
+        if weather is not None:
+            self.put(city, format_type, weather)
+        return weather, ошибка
+
+    def _revalidate(self, key, city, format_type, fetch):
+        try:
+            self._fetch_and_store(city, format_type, fetch)
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def wait_refreshes(self, timeout=None):
+        with self._lock:
+            threads = list(self._threads)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in threads:
+            thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM weather")
+                self._db.commit()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses
+            }
@@ -0,0 +1,89 @@
+import json
+from collections import namedtuple
+
+WeatherReport = namedtuple("WeatherReport", [
+    "city", "observed_at", "temperature_c", "feels_like_c", "humidity",
+    "wind_kmph", "wind_dir", "pressure_mb", "description", "hourly"
+])
+
+HourlyForecast = namedtuple("HourlyForecast", [
+    "date", "time", "temperature_c", "feels_like_c", "humidity",
+    "wind_kmph", "chance_of_rain", "description"
+])
+
+def _value(items, default=""):
+    if items:
+        return items[0].get("value", default)
+    return default
+
+def _int(value, default=None):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+def _description(block):
+    return _value(block.get("lang_ru")) or _value(block.get("weatherDesc"))
+
+def parse_weather_json(data, city=None):
+    current = (data.get("current_condition") or [{}])[0]
+    area = (data.get("nearest_area") or [{}])[0]
+    hourly = []
+    for day in data.get("weather") or []:
+        for hour in day.get("hourly") or []:
+            hourly.append(HourlyForecast(
+                day.get("date", ""),
+                f"{_int(hour.get('time'), 0) // 100:02d}:00",
+                _int(hour.get("tempC")),
+                _int(hour.get("FeelsLikeC")),
+                _int(hour.get("humidity")),
+                _int(hour.get("windspeedKmph")),
+                _int(hour.get("chanceofrain")),
+                _description(hour)
+            ))
+    return WeatherReport(
+        city or _value(area.get("areaName")),
+        current.get("localObsDateTime", ""),
+        _int(current.get("temp_C")),
+        _int(current.get("FeelsLikeC")),
+        _int(current.get("humidity")),
+        _int(current.get("windspeedKmph")),
+        current.get("winddir16Point", ""),
+        _int(current.get("pressure")),
+        _description(current),
+        tuple(hourly)
+    )
+
+def report_to_json(report):
+    return json.dumps([list(report[:-1]), [list(hour) for hour in report.hourly]],
+                      ensure_ascii=False, separators=(",", ":"))
+
+def report_from_json(text):
+    fields, hourly = json.loads(text)
+    return WeatherReport(*fields, tuple(HourlyForecast(*hour) for hour in hourly))
+
+def report_to_dict(report):
+    result = report._asdict()
+    result["hourly"] = [hour._asdict() for hour in report.hourly]
+    return result
+
+def _cell(value):
+    return "-" if value is None else str(value)
+
+def report_lines(report):
+    lines = [
+        f"Город: {report.city}",
+        f"Время наблюдения: {report.observed_at}",
+        f"Температура: {report.temperature_c}°C (ощущается как {report.feels_like_c}°C)",
+        f"Погода: {report.description}",
+        f"Влажность: {report.humidity}%",
+        f"Ветер: {report.wind_kmph} км/ч, {report.wind_dir}",
+        f"Давление: {report.pressure_mb} мбар"
+    ]
+    if report.hourly:
+        lines.append("")
+        lines.append(f"{'Дата':<12} {'Время':<7} {'°C':<5} {'Ветер':<7} {'Вл. %':<7} {'Дождь %':<9} Погода")
+        for hour in report.hourly:
+            lines.append(f"{hour.date:<12} {hour.time:<7} {_cell(hour.temperature_c):<5} {_cell(hour.wind_kmph):<7} "
+                         f"{_cell(hour.humidity):<7} {_cell(hour.chance_of_rain):<9} {hour.description}")
+    return lines
@@ -0,0 +1,137 @@
+import hashlib
+import heapq
+import json
+import os
+import threading
+import time
+
+from . import fetch_weather, fetch_weather_report
+
+POLL_INTERVAL = 1800.0
+POLL_MIN_INTERVAL = 600.0
+POLL_MAX_INTERVAL = 3 * 3600.0
+POLL_BUDGET = 600
+POLL_STORE = "weather_history.jsonl"
+
+class WeatherStore:
+    def __init__(self, path=POLL_STORE):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def append(self, record):
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+    def records(self, city=None, since=None):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if city is not None and record['city'] != city:
+                    continue
+                if since is not None and record['time'] < since:
+                    continue
+                yield record
+
+    def latest(self):
+        result = {}
+        for record in self.records():
+            if record['value'] is not None:
+                result[record['city']] = record
+        return result
+
+class WeatherScheduler:
+    def __init__(self, cities, format_type='short', interval=POLL_INTERVAL, min_interval=POLL_MIN_INTERVAL,
+                 max_interval=POLL_MAX_INTERVAL, budget=POLL_BUDGET, store=None):
+        self.format_type = format_type
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.spacing = 3600.0 / budget if budget else 0.0
+        self.store = store or WeatherStore()
+        self.intervals = {}
+        self.digests = {}
+        self._queue = []
+        self._last_fetch = None
+        self._stop = threading.Event()
+        now = time.monotonic()
+        cities = list(dict.fromkeys(cities))
+        step = interval / len(cities) if cities else 0.0
+        for index, city in enumerate(cities):
+            self.intervals[city] = interval
+            heapq.heappush(self._queue, (now + index * step, index, city))
+
+    def _fetch(self, city):
+        if self.format_type == 'json':
+            return fetch_weather_report(city)
+        return fetch_weather(city, self.format_type)
+
+    def next_wakeup(self):
+        if not self._queue:
+            return None
+        due = self._queue[0][0]
+        if self._last_fetch is not None:
+            due = max(due, self._last_fetch + self.spacing)
+        return due
+
+    def step(self, now=None):
+        now = time.monotonic() if now is None else now
+        wakeup = self.next_wakeup()
+        if wakeup is None or wakeup > now:
+            return None
+        due, order, city = heapq.heappop(self._queue)
+        self._last_fetch = now
+        value, ошибка = self._fetch(city)
+        interval = self.intervals[city]
+        changed = False
+        if value is not None:
+            digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16).hexdigest()
+            changed = digest != self.digests.get(city)
+            self.digests[city] = digest
+            if changed:
+                interval = max(self.min_interval, interval / 2)
+            else:
+                interval = min(self.max_interval, interval * 1.5)
+            self.intervals[city] = interval
+        self.store.append({
+            'time': time.time(),
+            'city': city,
+            'format': self.format_type,
+            'changed': changed,
+            'interval': interval,
+            'value': value if changed else None,
+            'error': ошибка
+        })
+        heapq.heappush(self._queue, (now + interval, order, city))
+        return city
+
+    def run(self, duration=None):
+        deadline = None if duration is None else time.monotonic() + duration
+        fetched = 0
+        while not self._stop.is_set():
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            if self.step() is not None:
+                fetched += 1
+                continue
+            wakeup = self.next_wakeup()
+            if wakeup is None:
+                break
+            if deadline is not None:
+                wakeup = min(wakeup, deadline)
+            self._stop.wait(max(0.0, wakeup - time.monotonic()))
+        return fetched
+
+    def stop(self):
+        self._stop.set()
+
+    def schedule(self):
+        return sorted((due, city, self.intervals[city]) for due, order, city in self._queue)
@@ -0,0 +1,101 @@
+import random
+import threading
+import time
+
+RATE_LIMIT = 5.0
+RATE_BURST = 10
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 10.0
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+class RequestStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {'requests': 0, 'coalesced': 0, 'throttled': 0, 'retried': 0}
+
+    def add(self, name, value=1):
+        with self._lock:
+            self._counters[name] += value
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._counters)
+
+    def reset(self):
+        with self._lock:
+            for name in self._counters:
+                self._counters[name] = 0
+
+class TokenBucket:
+    def __init__(self, rate=RATE_LIMIT, burst=RATE_BURST, stats=None):
+        self.rate = rate
+        self.burst = burst
+        self.stats = stats
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        waited = False
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    if waited and self.stats is not None:
+                        self.stats.add('throttled')
+                    return
+                delay = (1 - self._tokens) / self.rate
+            waited = True
+            time.sleep(delay)
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class Coalescer:
+    def __init__(self, stats=None):
+        self.stats = stats
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def run(self, key, func):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+        if not leader:
+            if self.stats is not None:
+                self.stats.add('coalesced')
+            call.done.wait()
+        else:
+            try:
+                call.result = func()
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+def backoff_delay(attempt, retry_after=None):
+    if retry_after:
+        try:
+            return min(BACKOFF_MAX, max(0.0, float(retry_after)))
+        except ValueError:
+            pass
+    delay = min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt))
+    return delay / 2 + random.uniform(0, delay / 2)